@@ -4,14 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import io
 import json
 import os
+import posixpath
 import re
 import sys
+import tarfile
+import zipfile
 from collections import defaultdict
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Iterable
+from dataclasses import dataclass, field
+from functools import total_ordering
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable, Iterator
 
 try:
     import tomllib  # Python 3.11+
@@ -125,10 +131,147 @@ LAYER_KEYWORDS = {
     "e2e_web": ["playwright", "cypress", "stagehand", "selenium"],
 }
 
-API_ROUTE_PATTERNS = [
-    re.compile(r"@(app|router)\.(get|post|put|delete|patch|options|head)\("),
-    re.compile(r"\b(app|router)\.(get|post|put|delete|patch|options|head)\("),
-]
+HTTP_VERBS = "get|post|put|delete|patch|options|head"
+
+ROUTE_PATTERNS = {
+    (".py",): {
+        "fastapi": [rf"@\w+\.(?:{HTTP_VERBS}|api_route|websocket)\("],
+        "flask": [r"@\w+\.route\("],
+        "django": [r"\b(?:re_)?path\(\s*r?[\"'][^\"']*[\"']\s*,", r"\burl\(\s*r?[\"']\^"],
+    },
+    (".js", ".mjs", ".cjs", ".jsx", ".ts", ".mts", ".cts", ".tsx"): {
+        "express_hono": [rf"\b(?:app|router|server)\.(?:{HTTP_VERBS}|all)\("],
+        "nextjs": [
+            r"\bexport\s+(?:async\s+)?function\s+(?:GET|POST|PUT|DELETE|PATCH|OPTIONS|HEAD)\b",
+            r"\bexport\s+const\s+(?:GET|POST|PUT|DELETE|PATCH|OPTIONS|HEAD)\s*=",
+        ],
+    },
+    (".go",): {
+        "net_http": [r"\.(?:HandleFunc|Handle)\(\s*\""],
+        # A handler must follow the path, or net/http client calls like client.Get("/status") count too.
+        "chi": [
+            r"\.(?:Get|Post|Put|Delete|Patch|Options|Head)\(\s*\"/[^\"]*\"\s*,\s*\w",
+            r"\.(?:Method|MethodFunc)\(\s*\"\w+\"\s*,\s*\"/[^\"]*\"\s*,\s*\w",
+        ],
+        "gin": [r"\.(?:GET|POST|PUT|DELETE|PATCH|OPTIONS|HEAD|Any)\(\s*\"/"],
+    },
+    (".rs",): {
+        "axum": [r"\.route\(\s*\"[^\"]*\"\s*,\s*(?:get|post|put|delete|patch|any|on)\("],
+        "actix": [
+            rf"#\[(?:{HTTP_VERBS})\(\s*\"",
+            r"\.route\(\s*\"[^\"]*\"\s*,\s*web::",
+        ],
+    },
+}
+
+
+def compile_route_matchers() -> dict[str, re.Pattern[str]]:
+    """Fold each language's framework patterns into one alternation with a named group per framework."""
+    matchers: dict[str, re.Pattern[str]] = {}
+    for suffixes, frameworks in ROUTE_PATTERNS.items():
+        pattern = re.compile(
+            "|".join(f"(?P<{name}>{'|'.join(patterns)})" for name, patterns in frameworks.items())
+        )
+        for suffix in suffixes:
+            matchers[suffix] = pattern
+    return matchers
+
+
+ROUTE_MATCHERS = compile_route_matchers()
+
+CODE_SUFFIXES = {".py", ".js", ".ts", ".tsx", ".go", ".rs"}
+
+LANGUAGE_BY_SUFFIX = {
+    ".py": "Python",
+    ".pyi": "Python",
+    ".js": "JavaScript",
+    ".mjs": "JavaScript",
+    ".cjs": "JavaScript",
+    ".jsx": "JavaScript",
+    ".ts": "TypeScript",
+    ".mts": "TypeScript",
+    ".cts": "TypeScript",
+    ".tsx": "TypeScript",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".java": "Java",
+    ".kt": "Kotlin",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".c": "C",
+    ".h": "C",
+    ".cc": "C++",
+    ".cpp": "C++",
+    ".hpp": "C++",
+    ".cs": "C#",
+    ".swift": "Swift",
+    ".lua": "Lua",
+    ".sh": "Shell",
+    ".bash": "Shell",
+    ".zsh": "Shell",
+    ".sql": "SQL",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".scss": "CSS",
+    ".md": "Markdown",
+    ".json": "JSON",
+    ".jsonc": "JSON",
+    ".yml": "YAML",
+    ".yaml": "YAML",
+    ".toml": "TOML",
+    ".tf": "Terraform",
+    ".hurl": "Hurl",
+}
+
+LANGUAGE_BY_FILENAME = {
+    "dockerfile": "Dockerfile",
+    "makefile": "Makefile",
+}
+
+BINARY_SUFFIXES = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".ico",
+    ".pdf",
+    ".zip",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".tar",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".otf",
+    ".mp3",
+    ".mp4",
+    ".mov",
+    ".so",
+    ".dylib",
+    ".dll",
+    ".exe",
+    ".rlib",
+    ".pyc",
+    ".class",
+    ".jar",
+    ".wasm",
+    ".db",
+    ".sqlite",
+}
+
+EXIT_UNCHANGED = 0
+EXIT_CHANGED = 3
+
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz", ".tar", ".zip")
+
+READ_LIMIT = 512_000
+SERVICE_FILE_BUDGET = 400
+STATS_BYTE_BUDGET = 64_000_000
+# Archives are buffered whole, so detector reads from them need a cap of their own.
+ARCHIVE_DETECTOR_BYTE_BUDGET = 128_000_000
 
 REQ_PATTERN = re.compile(r"^([A-Za-z0-9_.-]+)(?:\[[^\]]+\])?\s*(.*)$")
 VER_NUM_PATTERN = re.compile(r"\d+(?:\.\d+){0,3}")
@@ -152,13 +295,230 @@ class PackageVersion:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Collect README facts from a repository")
-    parser.add_argument("--repo", default=".", help="Path to repository")
+    parser.add_argument(
+        "--repo",
+        default=".",
+        help="Path to repository, or a .tar/.tar.gz/.tgz/.tar.bz2/.tar.xz/.zip archive scanned in place",
+    )
     parser.add_argument("--format", choices=["json", "markdown"], default="json")
     parser.add_argument("--max-files", type=int, default=5000, help="Max files to inspect")
+    parser.add_argument(
+        "--max-read-bytes",
+        type=int,
+        default=STATS_BYTE_BUDGET,
+        help="Byte budget for reading files only needed for line statistics",
+    )
+    parser.add_argument(
+        "--diff-against",
+        metavar="PREVIOUS_JSON",
+        help="Compare with a previous JSON snapshot and print the delta instead of the facts "
+        f"(exit {EXIT_UNCHANGED} if nothing material changed, {EXIT_CHANGED} if it did)",
+    )
+    parser.add_argument("--output", help="Also write the JSON fact snapshot to this path")
     return parser.parse_args()
 
 
+@dataclass
+class ArchiveMember:
+    size: int
+    data: bytes | None
+
+
+@dataclass
+class ArchiveTree:
+    source: str
+    members: dict[str, ArchiveMember] = field(default_factory=dict)
+    dirs: set[str] = field(default_factory=set)
+
+
+@total_ordering
+class ArchivePath:
+    """Read-only stand-in for ``Path`` over members buffered from an archive.
+
+    Implements only the subset of the ``Path`` API the detectors use, so they
+    run unchanged whether ``--repo`` is a directory or an archive. Paths in
+    the same archive order by their member path, as ``sorted`` needs.
+    """
+
+    def __init__(self, tree: ArchiveTree, rel: str = "") -> None:
+        self.tree = tree
+        self.rel = rel
+
+    def __truediv__(self, other: str) -> ArchivePath:
+        joined = posixpath.normpath(posixpath.join(self.rel, str(other)))
+        return ArchivePath(self.tree, "" if joined == "." else joined)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ArchivePath) and other.tree is self.tree and other.rel == self.rel
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, ArchivePath) or other.tree is not self.tree:
+            return NotImplemented
+        return self.rel.split("/") < other.rel.split("/")
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.rel))
+
+    def __str__(self) -> str:
+        return f"{self.tree.source}!/{self.rel}" if self.rel else self.tree.source
+
+    def __repr__(self) -> str:
+        return f"ArchivePath({str(self)!r})"
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.rel).name
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.rel).suffix
+
+    def exists(self) -> bool:
+        return self.is_dir() or self.rel in self.tree.members
+
+    def is_dir(self) -> bool:
+        return not self.rel or self.rel in self.tree.dirs
+
+    def relative_to(self, other: ArchivePath) -> PurePosixPath:
+        if not other.rel:
+            return PurePosixPath(self.rel)
+        prefix = other.rel + "/"
+        if not self.rel.startswith(prefix):
+            raise ValueError(f"{self} is not relative to {other}")
+        return PurePosixPath(self.rel[len(prefix) :])
+
+    def _member(self) -> ArchiveMember:
+        member = self.tree.members.get(self.rel)
+        if member is None:
+            raise FileNotFoundError(str(self))
+        return member
+
+    def stat(self) -> os.stat_result:
+        return os.stat_result((0o100644, 0, 0, 1, 0, 0, self._member().size, 0, 0, 0))
+
+    def open(self, mode: str = "rb") -> io.BytesIO:
+        if mode != "rb":
+            raise ValueError("archive members are read-only and binary")
+        return io.BytesIO(self._member().data or b"")
+
+    def read_text(self) -> str:
+        return (self._member().data or b"").decode("utf-8")
+
+    def glob(self, pattern: str) -> Iterator[ArchivePath]:
+        segments = pattern.split("/")
+        prefix = self.rel + "/" if self.rel else ""
+        for rel in self.tree.members:
+            if not rel.startswith(prefix):
+                continue
+            parts = rel[len(prefix) :].split("/")
+            if len(parts) == len(segments) and all(
+                fnmatch.fnmatchcase(part, segment) for part, segment in zip(parts, segments)
+            ):
+                yield ArchivePath(self.tree, rel)
+
+
+def is_archive(path: Path) -> bool:
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def iter_archive_members(path: Path) -> Iterator[tuple[str, int, Callable[[int], bytes]]]:
+    if path.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as handle:
+                    yield info.filename, info.file_size, handle.read
+        return
+
+    # Stream mode reads the compressed archive strictly front to back.
+    with tarfile.open(path, "r|*") as archive:
+        for info in archive:
+            if not info.isfile():
+                continue
+            handle = archive.extractfile(info)
+            if handle is None:
+                continue
+            yield info.name, info.size, handle.read
+
+
+def is_detector_path(rel: str) -> bool:
+    path = PurePosixPath(rel)
+    if path.suffix.lower() in CODE_SUFFIXES:
+        return True
+    # The shared top-level directory is not stripped yet, so check with and without it.
+    tail = rel.split("/", 1)[-1]
+    return is_service_candidate(path, rel) or is_service_candidate(path, tail)
+
+
+def load_archive(path: Path, max_files: int, byte_budget: int = STATS_BYTE_BUDGET) -> ArchivePath:
+    """Buffer archive members in one sequential pass, applying ignore rules and size limits per member.
+
+    Ignored directories are never read. Each member keeps at most ``READ_LIMIT``
+    bytes. Members outside hidden directories past the first ``max_files``
+    (which walk_files would not return) keep their size but no data, except
+    top-level files, which detectors look up by name. Detector paths share
+    ``ARCHIVE_DETECTOR_BYTE_BUDGET`` and members only useful for line
+    statistics share ``byte_budget``; binary suffixes and anything past its
+    budget keep their size but no data.
+    """
+    raw_members: dict[str, ArchiveMember] = {}
+    buffered = 0
+    detector_buffered = 0
+    walked = 0
+    for raw_name, size, read in iter_archive_members(path):
+        rel = posixpath.normpath(raw_name.lstrip("/"))
+        if rel in {".", ""} or rel.startswith("../"):
+            continue
+        parents = rel.split("/")[:-1]
+        if any(part in IGNORED_DIRS for part in parents):
+            continue
+
+        hidden = any(part.startswith(".") for part in parents)
+        # Depth 1 covers the archive's single top-level directory, which is stripped below.
+        walked_past = not hidden and walked >= max_files and len(parents) > 1
+        if not hidden:
+            walked += 1
+
+        data: bytes | None = None
+        if PurePosixPath(rel).suffix.lower() not in BINARY_SUFFIXES and not walked_past:
+            wanted = min(size, READ_LIMIT)
+            if is_detector_path(rel):
+                if detector_buffered + wanted <= ARCHIVE_DETECTOR_BYTE_BUDGET:
+                    data = read(READ_LIMIT)
+                    detector_buffered += len(data)
+            elif buffered + wanted <= byte_budget:
+                data = read(READ_LIMIT)
+                buffered += len(data)
+        raw_members[rel] = ArchiveMember(size=size, data=data)
+
+    top_levels = {rel.split("/", 1)[0] for rel in raw_members}
+    strip = len(top_levels) == 1 and all("/" in rel for rel in raw_members)
+
+    tree = ArchiveTree(source=str(path))
+    for rel, member in raw_members.items():
+        if strip:
+            rel = rel.split("/", 1)[1]
+        tree.members[rel] = member
+        parent = posixpath.dirname(rel)
+        while parent and parent not in tree.dirs:
+            tree.dirs.add(parent)
+            parent = posixpath.dirname(parent)
+    return ArchivePath(tree)
+
+
 def walk_files(repo: Path, max_files: int) -> list[Path]:
+    if isinstance(repo, ArchivePath):
+        archive_files: list[Path] = []
+        for rel in repo.tree.members:
+            parts = rel.split("/")[:-1]
+            if any(part in IGNORED_DIRS or part.startswith(".") for part in parts):
+                continue
+            archive_files.append(repo / rel)
+            if len(archive_files) >= max_files:
+                break
+        return archive_files
+
     files: list[Path] = []
     for root, dirnames, filenames in os.walk(repo):
         dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS and not d.startswith(".")]
@@ -174,14 +534,31 @@ def relpath(path: Path, repo: Path) -> str:
     return path.relative_to(repo).as_posix()
 
 
-def read_text(path: Path, limit: int = 512_000) -> str:
+def read_bytes(path: Path, limit: int = READ_LIMIT) -> bytes:
     try:
-        raw = path.read_bytes()
+        with path.open("rb") as handle:
+            return handle.read(limit)
     except OSError:
-        return ""
-    if len(raw) > limit:
-        raw = raw[:limit]
-    return raw.decode("utf-8", errors="ignore")
+        return b""
+
+
+def read_text(path: Path, limit: int = READ_LIMIT) -> str:
+    return read_bytes(path, limit).decode("utf-8", errors="ignore")
+
+
+def count_lines(raw: bytes) -> int:
+    if not raw:
+        return 0
+    return raw.count(b"\n") + (0 if raw.endswith(b"\n") else 1)
+
+
+def language_for(path: Path) -> str:
+    name = path.name.lower()
+    if name in LANGUAGE_BY_FILENAME:
+        return LANGUAGE_BY_FILENAME[name]
+    if name.startswith("dockerfile."):
+        return "Dockerfile"
+    return LANGUAGE_BY_SUFFIX.get(path.suffix.lower(), "Other")
 
 
 def parse_precision(version: str) -> str:
@@ -606,23 +983,121 @@ def detect_deploy(repo: Path) -> list[dict[str, str]]:
     return detected
 
 
-def detect_external_services(
-    repo: Path, files: Iterable[Path], versions: dict[str, PackageVersion]
-) -> list[dict[str, str]]:
-    file_candidates: list[Path] = []
+def is_service_candidate(path: Path, rel: str) -> bool:
+    name = path.name.lower()
+    if name.startswith(".env") or name.endswith((".yml", ".yaml", ".toml", ".json", ".ini", ".cfg")):
+        return True
+    if "/config" in rel or rel.startswith("config"):
+        return True
+    if rel.startswith("app/") or rel.startswith("src/"):
+        return path.suffix.lower() in CODE_SUFFIXES
+    return False
+
+
+def service_candidates(repo: Path, files: Iterable[Path]) -> list[Path]:
+    candidates = [path for path in files if is_service_candidate(path, relpath(path, repo))]
+    return candidates[:SERVICE_FILE_BUDGET]
+
+
+def count_routes(path: Path, text: str) -> dict[str, int]:
+    matcher = ROUTE_MATCHERS.get(path.suffix.lower())
+    if matcher is None or not text:
+        return {}
+    counts: dict[str, int] = defaultdict(int)
+    for match in matcher.finditer(text):
+        counts[match.lastgroup] += 1
+    return dict(counts)
+
+
+@dataclass
+class ContentScan:
+    texts: dict[Path, str]
+    languages: dict[str, dict[str, int]]
+    routes: dict[Path, dict[str, int]] = field(default_factory=dict)
+
+    def text(self, path: Path) -> str:
+        cached = self.texts.get(path)
+        return cached if cached is not None else read_text(path)
+
+    def language_stats(self) -> list[dict[str, object]]:
+        return [
+            {
+                "name": name,
+                "files": stats["files"],
+                "bytes": stats["bytes"],
+                "lines": stats["lines"],
+                "estimated_files": stats["estimated_files"],
+                "estimated": stats["estimated_files"] > 0,
+            }
+            for name, stats in sorted(self.languages.items(), key=lambda item: (-item[1]["bytes"], item[0]))
+        ]
+
+
+def scan_contents(repo: Path, files: list[Path], byte_budget: int = STATS_BYTE_BUDGET) -> ContentScan:
+    """Read each file at most once, counting routes and tallying per-language stats.
+
+    Files needed by a detector are always read, but only service candidates
+    keep their text for later detectors; other code files are decoded for
+    route counts and dropped. Other files are read only for
+    line counts while ``byte_budget`` lasts; anything left unread (budget spent,
+    binary suffix or NUL bytes, truncated at ``READ_LIMIT``) contributes its
+    stat size and is flagged as an estimate.
+    """
+    candidates = set(service_candidates(repo, files))
+    wanted = set(candidates)
+    wanted.update(
+        path for path in files if path.suffix.lower() in CODE_SUFFIXES or path.suffix.lower() in ROUTE_MATCHERS
+    )
+
+    texts: dict[Path, str] = {}
+    routes: dict[Path, dict[str, int]] = {}
+    languages: dict[str, dict[str, int]] = defaultdict(
+        lambda: {"files": 0, "bytes": 0, "lines": 0, "estimated_files": 0}
+    )
+    remaining = byte_budget
+
     for path in files:
-        rel = relpath(path, repo)
-        name = path.name.lower()
-        if name.startswith(".env") or name.endswith((".yml", ".yaml", ".toml", ".json", ".ini", ".cfg")):
-            file_candidates.append(path)
+        stats = languages[language_for(path)]
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        stats["files"] += 1
+        stats["bytes"] += size
+
+        needed = path in wanted
+        if not needed and (path.suffix.lower() in BINARY_SUFFIXES or size > remaining):
+            stats["estimated_files"] += 1
             continue
-        if "/config" in rel or rel.startswith("config"):
-            file_candidates.append(path)
+
+        raw = read_bytes(path)
+        if not needed:
+            remaining -= len(raw)
+        else:
+            text = raw.decode("utf-8", errors="ignore")
+            if path in candidates:
+                texts[path] = text
+            route_counts = count_routes(path, text)
+            if route_counts:
+                routes[path] = route_counts
+
+        if b"\0" in raw[:8192]:
+            stats["estimated_files"] += 1
             continue
-        if rel.startswith("app/") or rel.startswith("src/"):
-            if path.suffix.lower() in {".py", ".js", ".ts", ".tsx", ".go", ".rs"}:
-                file_candidates.append(path)
+        stats["lines"] += count_lines(raw)
+        if len(raw) < size:
+            stats["estimated_files"] += 1
+
+    return ContentScan(texts=texts, languages=dict(languages), routes=routes)
 
+
+def detect_external_services(
+    repo: Path,
+    files: Iterable[Path],
+    versions: dict[str, PackageVersion],
+    contents: ContentScan | None = None,
+) -> list[dict[str, str]]:
+    file_candidates = service_candidates(repo, files)
     custom_patterns, custom_packages, custom_sources = load_custom_service_hints(repo)
 
     service_patterns = {name: list(patterns) for name, patterns in SERVICE_PATTERNS.items()}
@@ -636,8 +1111,8 @@ def detect_external_services(
         package_hints[service].extend(token for token in tokens if token not in package_hints[service])
 
     observed: dict[str, set[str]] = defaultdict(set)
-    for path in file_candidates[:400]:
-        text = read_text(path).lower()
+    for path in file_candidates:
+        text = (contents.text(path) if contents else read_text(path)).lower()
         if not text:
             continue
         rel = relpath(path, repo)
@@ -775,41 +1250,46 @@ def detect_tests(repo: Path, files: list[Path], tools: list[dict[str, str]], ci_
     return layer_data
 
 
-def detect_api_surface(repo: Path, files: list[Path]) -> dict[str, object]:
-    endpoint_count = 0
-    evidence: dict[str, int] = defaultdict(int)
-
-    for path in files:
-        if path.suffix.lower() not in {".py", ".js", ".ts", ".tsx", ".go", ".rs"}:
-            continue
-        text = read_text(path)
-        if not text:
-            continue
-        local_count = 0
-        for pattern in API_ROUTE_PATTERNS:
-            local_count += len(pattern.findall(text))
-        if local_count:
-            endpoint_count += local_count
-            evidence[relpath(path, repo)] += local_count
-
+def detect_api_surface(repo: Path, files: list[Path], contents: ContentScan | None = None) -> dict[str, object]:
+    if contents is not None:
+        per_file = contents.routes
+    else:
+        per_file = {}
+        for path in files:
+            if path.suffix.lower() in ROUTE_MATCHERS:
+                route_counts = count_routes(path, read_text(path))
+                if route_counts:
+                    per_file[path] = route_counts
+
+    frameworks: dict[str, int] = defaultdict(int)
+    evidence: dict[str, int] = {}
+    for path, route_counts in per_file.items():
+        for framework, count in route_counts.items():
+            frameworks[framework] += count
+        evidence[relpath(path, repo)] = sum(route_counts.values())
+
+    endpoint_count = sum(frameworks.values())
     top_evidence = sorted(evidence.items(), key=lambda item: item[1], reverse=True)[:5]
     return {
         "exposed": endpoint_count > 0,
         "estimated_endpoint_decorators": endpoint_count,
+        "frameworks": dict(sorted(frameworks.items())),
         "evidence": [f"{path} ({count})" for path, count in top_evidence],
     }
 
 
-def gather_facts(repo: Path, files: list[Path]) -> dict[str, object]:
+def gather_facts(repo: Path, files: list[Path], read_budget: int = STATS_BYTE_BUDGET) -> dict[str, object]:
+    contents = scan_contents(repo, files, read_budget)
     versions = collect_versions(repo)
     runtime = detect_runtime(repo, versions)
     tools = select_tools(versions)
     tools = augment_tools_from_files(repo, files, tools)
     ci, ci_text = detect_ci(repo)
     deployment = detect_deploy(repo)
-    services = detect_external_services(repo, files, versions)
+    services = detect_external_services(repo, files, versions, contents)
     tests = detect_tests(repo, files, tools, ci_text)
-    api = detect_api_surface(repo, files)
+    api = detect_api_surface(repo, files, contents)
+    languages = contents.language_stats()
 
     gaps: list[str] = []
     for layer in TEST_LAYER_ORDER:
@@ -833,16 +1313,150 @@ def gather_facts(repo: Path, files: list[Path]) -> dict[str, object]:
         "external_services": services,
         "testing": tests,
         "api_surface": api,
+        "languages": languages,
         "gaps": gaps,
         "counts": {
             "files_scanned": len(files),
             "tools_detected": len(tools),
             "deploy_targets_detected": len(deployment),
             "external_services_detected": len(services),
+            "bytes_total": sum(int(item["bytes"]) for item in languages),
+            "lines_total": sum(int(item["lines"]) for item in languages),
         },
     }
 
 
+def canonical_json(data: object) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def material_view(facts: dict[str, object]) -> dict[str, object]:
+    """Reduce a snapshot to the fields README generation depends on.
+
+    Evidence strings, file counts and language stats move on almost every edit
+    and are left out so they never count as a material change.
+    """
+    testing = facts.get("testing", {}) if isinstance(facts.get("testing"), dict) else {}
+    api = facts.get("api_surface", {}) if isinstance(facts.get("api_surface"), dict) else {}
+    return {
+        "runtime": {item["name"]: item.get("version", "unknown") for item in facts.get("runtime", [])},
+        "tools": {item["name"]: item.get("version", "unknown") for item in facts.get("tools", [])},
+        "ci": sorted(item["provider"] for item in facts.get("ci", [])),
+        "deployment": sorted(item["name"] for item in facts.get("deployment", [])),
+        "external_services": sorted(item["name"] for item in facts.get("external_services", [])),
+        "testing": {
+            layer: {
+                "present": bool(details.get("present")),
+                "ci": bool(details.get("ci")),
+                "tools": sorted(details.get("tools", [])),
+            }
+            for layer, details in sorted(testing.items())
+            if isinstance(details, dict)
+        },
+        "api_exposed": bool(api.get("exposed")),
+        "gaps": sorted(facts.get("gaps", [])),
+    }
+
+
+SNAPSHOT_ITEM_KEYS = {
+    "runtime": "name",
+    "tools": "name",
+    "ci": "provider",
+    "deployment": "name",
+    "external_services": "name",
+}
+
+
+def snapshot_problem(facts: dict[str, object]) -> str | None:
+    """Describe the first field material_view cannot read, or None if the snapshot has the expected shape."""
+    for section, key in SNAPSHOT_ITEM_KEYS.items():
+        items = facts.get(section, [])
+        if not isinstance(items, list):
+            return f"'{section}' is not a list"
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get(key), str):
+                return f"'{section}' entries need a string '{key}'"
+            if section in {"runtime", "tools"} and not isinstance(item.get("version", ""), str):
+                return f"'{section}' versions must be strings"
+    testing = facts.get("testing", {})
+    if isinstance(testing, dict):
+        for layer, details in testing.items():
+            tools = details.get("tools", []) if isinstance(details, dict) else []
+            if not isinstance(tools, list) or not all(isinstance(tool, str) for tool in tools):
+                return f"'testing.{layer}.tools' is not a list of strings"
+    gaps = facts.get("gaps", [])
+    if not isinstance(gaps, list) or not all(isinstance(gap, str) for gap in gaps):
+        return "'gaps' is not a list of strings"
+    return None
+
+
+def _set_delta(before: Iterable[str], after: Iterable[str]) -> dict[str, list[str]]:
+    before_set = set(before)
+    after_set = set(after)
+    return {"added": sorted(after_set - before_set), "removed": sorted(before_set - after_set)}
+
+
+def diff_facts(previous: dict[str, object], current: dict[str, object]) -> dict[str, object]:
+    before = material_view(previous)
+    after = material_view(current)
+    if canonical_json(before) == canonical_json(after):
+        return {"changed": False}
+
+    changed_versions: list[dict[str, str]] = []
+    for section in ["runtime", "tools"]:
+        for name in sorted(set(before[section]) & set(after[section])):
+            if before[section][name] != after[section][name]:
+                changed_versions.append(
+                    {
+                        "section": section,
+                        "name": name,
+                        "before": before[section][name],
+                        "after": after[section][name],
+                    }
+                )
+
+    def present_layers(view: dict[str, object], key: str) -> list[str]:
+        return [layer for layer, details in view["testing"].items() if details[key]]
+
+    delta: dict[str, object] = {
+        "changed": True,
+        "runtime": _set_delta(before["runtime"], after["runtime"]),
+        "tools": _set_delta(before["tools"], after["tools"]),
+        "versions": changed_versions,
+        "ci": _set_delta(before["ci"], after["ci"]),
+        "deployment": _set_delta(before["deployment"], after["deployment"]),
+        "external_services": _set_delta(before["external_services"], after["external_services"]),
+        "test_layers": _set_delta(present_layers(before, "present"), present_layers(after, "present")),
+        "test_layers_in_ci": _set_delta(present_layers(before, "ci"), present_layers(after, "ci")),
+        "gaps": _set_delta(before["gaps"], after["gaps"]),
+    }
+    if before["api_exposed"] != after["api_exposed"]:
+        delta["api_exposed"] = {"before": before["api_exposed"], "after": after["api_exposed"]}
+    return delta
+
+
+def delta_to_markdown(delta: dict[str, object]) -> str:
+    lines = ["# README Fact Delta", ""]
+    if not delta.get("changed"):
+        lines.append("- no material changes")
+        return "\n".join(lines) + "\n"
+
+    for key, value in delta.items():
+        if key == "changed":
+            continue
+        if key == "versions":
+            for item in value:
+                lines.append(f"- {item['section']} {item['name']}: {item['before']} -> {item['after']}")
+        elif key == "api_exposed":
+            lines.append(f"- api exposed: {value['before']} -> {value['after']}")
+        else:
+            for name in value["added"]:
+                lines.append(f"- {key} added: {name}")
+            for name in value["removed"]:
+                lines.append(f"- {key} removed: {name}")
+    return "\n".join(lines) + "\n"
+
+
 def _fmt_version(item: dict[str, str]) -> str:
     version = item.get("version", "unknown")
     source = item.get("source", "unknown")
@@ -917,11 +1531,26 @@ def to_markdown(data: dict[str, object]) -> str:
     exposed = "yes" if api.get("exposed") else "no"
     lines.append(f"- Exposed: {exposed}")
     lines.append(f"- Estimated route decorators: {api.get('estimated_endpoint_decorators', 0)}")
+    frameworks = api.get("frameworks", {})
+    if frameworks:
+        lines.append(f"- Frameworks: {', '.join(f'{name} ({count})' for name, count in frameworks.items())}")
     evidence = api.get("evidence", [])
     if evidence:
         lines.append(f"- Evidence: {', '.join(evidence)}")
     lines.append("")
 
+    lines.append("## Languages")
+    languages = data.get("languages", [])
+    if languages:
+        lines.append("| Language | Files | Bytes | Lines |")
+        lines.append("|---|---|---|---|")
+        for item in languages:
+            line_count = f"~{item['lines']}" if item.get("estimated") else str(item["lines"])
+            lines.append(f"| {item['name']} | {item['files']} | {item['bytes']} | {line_count} |")
+    else:
+        lines.append("- none detected")
+    lines.append("")
+
     lines.append("## Gaps")
     gaps = data.get("gaps", [])
     if gaps:
@@ -936,12 +1565,44 @@ def to_markdown(data: dict[str, object]) -> str:
 def main() -> int:
     args = parse_args()
     repo = Path(args.repo).expanduser().resolve()
-    if not repo.exists() or not repo.is_dir():
+    if is_archive(repo):
+        try:
+            repo = load_archive(repo, args.max_files, args.max_read_bytes)
+        except (OSError, tarfile.TarError, zipfile.BadZipFile) as error:
+            print(f"error: cannot read archive {repo}: {error}", file=sys.stderr)
+            return 1
+    elif not repo.exists() or not repo.is_dir():
         print(f"error: repo not found: {repo}", file=sys.stderr)
         return 1
 
+    previous: dict[str, object] | None = None
+    if args.diff_against:
+        try:
+            previous = json.loads(Path(args.diff_against).expanduser().read_text())
+        except (OSError, json.JSONDecodeError) as error:
+            print(f"error: cannot read previous snapshot {args.diff_against}: {error}", file=sys.stderr)
+            return 1
+        if not isinstance(previous, dict):
+            print(f"error: previous snapshot is not a JSON object: {args.diff_against}", file=sys.stderr)
+            return 1
+        problem = snapshot_problem(previous)
+        if problem:
+            print(f"error: unexpected previous snapshot {args.diff_against}: {problem}", file=sys.stderr)
+            return 1
+
     files = walk_files(repo, args.max_files)
-    facts = gather_facts(repo, files)
+    facts = gather_facts(repo, files, args.max_read_bytes)
+
+    if args.output:
+        Path(args.output).expanduser().write_text(json.dumps(facts, indent=2, sort_keys=True) + "\n")
+
+    if previous is not None:
+        delta = diff_facts(previous, facts)
+        if args.format == "json":
+            print(json.dumps(delta, indent=2, sort_keys=True))
+        else:
+            print(delta_to_markdown(delta), end="")
+        return EXIT_CHANGED if delta["changed"] else EXIT_UNCHANGED
 
     if args.format == "json":
         print(json.dumps(facts, indent=2, sort_keys=True))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for commit_pr_guard.classify_prompt over large pasted prompts.
+
+    .codex/hooks/bench_classify_prompt.py --repeat 20
+
+The corpus is generated in memory. Each case is timed with the current
+classifier and with the earlier per-pattern loop over the whole lowercased
+prompt. Every case names the decision the current classifier must reach;
+the script exits 1 if any differs. The legacy decision is only printed.
+
+The overlapping cases must decline: an approve phrase shares words with the
+refusal. Unfenced log lines are recognised by their timestamps and level
+tags; an unfenced paste without such markers is still scanned near the ends
+of the prompt, so a "no" in it declines (the "declines:" cases).
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import commit_pr_guard as guard  # noqa: E402
+
+
+LOG_LINE = "2024-05-01T12:00:00Z worker-3 INFO no retry needed, skip cache, ok status=200 path=/api/commit\n"
+
+
+def pasted_log(size: int) -> str:
+    return LOG_LINE * (size // len(LOG_LINE) + 1)
+
+
+PROSE_LINE = "The worker said there was no retry needed and the cache was ok this time.\n"
+
+
+def corpus() -> dict[str, tuple[str, str | None]]:
+    """Case name -> (prompt, decision classify_prompt must return)."""
+    log_1m = pasted_log(1 << 20)
+    log_8m = pasted_log(8 << 20)
+    prose_1m = PROSE_LINE * ((1 << 20) // len(PROSE_LINE) + 1)
+    return {
+        "short yes": ("yes, go ahead", "approved"),
+        "short no": ("no, leave it for now", "declined"),
+        "overlap, please do not": ("please do not commit", "declined"),
+        "overlap, upper case": ("Please do NOT commit this", "declined"),
+        "overlap, don't pr": ("sure, but don't pr it yet", "declined"),
+        "short bare log, yes last": (LOG_LINE * 3 + "ship it", "approved"),
+        "1MB fenced log, yes first": (f"yes please, here is the log\n```\n{log_1m}```\n", "approved"),
+        "1MB bare log, yes last": (f"{log_1m}\nlooks fine, ship it", "approved"),
+        "8MB bare log, no decision": (f"why does this fail?\n{log_8m}", None),
+        "8MB fenced log, no last": (f"```\n{log_8m}```\nnot now", "declined"),
+        "declines: unmarked paste inside window": (f"{prose_1m}\nship it", "declined"),
+    }
+
+
+def legacy_classify(prompt: str) -> str | None:
+    text = prompt.strip().lower()
+    if not text:
+        return None
+    for pattern in guard.NO_PATTERNS:
+        if re.search(pattern, text):
+            return "declined"
+    for pattern in guard.YES_PATTERNS:
+        if re.search(pattern, text):
+            return "approved"
+    return None
+
+
+def median_seconds(classify, prompt: str, repeat: int) -> tuple[float, str | None]:
+    timings = []
+    decision = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decision = classify(prompt)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), decision
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time classify_prompt on large generated prompts.")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case; the median is reported")
+    args = parser.parse_args()
+
+    mismatches = []
+    print(f"{'case':<40} {'size':>9} {'current':>18} {'legacy':>18}  expected")
+    for name, (prompt, expected) in corpus().items():
+        current, current_decision = median_seconds(guard.classify_prompt, prompt, args.repeat)
+        legacy, legacy_decision = median_seconds(legacy_classify, prompt, args.repeat)
+        mark = "" if current_decision == expected else "  MISMATCH"
+        print(
+            f"{name:<40} {len(prompt):>9} "
+            f"{current * 1e3:>8.3f}ms {str(current_decision):<8} "
+            f"{legacy * 1e3:>8.3f}ms {str(legacy_decision):<8}  {expected}{mark}"
+        )
+        if mark:
+            mismatches.append(name)
+    if mismatches:
+        print(f"unexpected decisions: {', '.join(mismatches)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Benchmark commit_pr_guard against generated local git repositories.
+
+    .codex/hooks/bench_commit_pr_guard.py --scenario small --scenario medium \
+        --output /tmp/guard-bench.json --baseline /tmp/guard-bench-before.json
+
+Each scenario builds a repo with the requested numbers of tracked, modified
+and untracked files and submodules, then feeds Stop and UserPromptSubmit
+payloads to commit_pr_guard.main() through stdin in this process. Every step
+records wall time, git subprocesses started (counted with an audit hook) and
+peak Python allocation (tracemalloc). Nothing touches the network: submodules
+are cloned from sibling directories.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import commit_pr_guard as guard  # noqa: E402
+
+
+@dataclass
+class Scenario:
+    tracked: int
+    modified: int
+    untracked: int
+    submodules: int = 0
+
+
+SCENARIOS = {
+    "small": Scenario(tracked=200, modified=5, untracked=5),
+    "medium": Scenario(tracked=5_000, modified=50, untracked=50, submodules=1),
+    "large": Scenario(tracked=50_000, modified=500, untracked=500, submodules=3),
+}
+
+# (step name, hook event, prompt); state is reset before the first step of each run.
+STEPS = [
+    ("stop_cold", "Stop", ""),
+    ("prompt_decline", "UserPromptSubmit", "no thanks, leave it"),
+    ("stop_after_decline", "Stop", ""),
+    ("prompt_large_paste", "UserPromptSubmit", "```\n" + "INFO no retry ok\n" * 60_000 + "```\nnot now"),
+]
+
+SPAWNED = 0
+
+
+def count_spawns(event: str, _args: tuple[object, ...]) -> None:
+    global SPAWNED
+    if event == "subprocess.Popen":
+        SPAWNED += 1
+
+
+def git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.invalid", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def write_files(root: Path, prefix: str, count: int, text: str) -> None:
+    for index in range(count):
+        # 100 files per directory keeps the tree shaped like a real project.
+        path = root / f"{prefix}{index // 100:04d}" / f"file{index:06d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def build_repo(base: Path, scenario: Scenario) -> Path:
+    repo = base / "repo"
+    repo.mkdir(parents=True)
+    git("init", "-q", "-b", "main", cwd=repo)
+    write_files(repo, "src", scenario.tracked, "tracked\n")
+    git("add", "-A", cwd=repo)
+    git("commit", "-q", "-m", "initial", cwd=repo)
+
+    for index in range(scenario.submodules):
+        source = base / f"submodule{index}"
+        source.mkdir()
+        git("init", "-q", "-b", "main", cwd=source)
+        write_files(source, "lib", 50, "library\n")
+        git("add", "-A", cwd=source)
+        git("commit", "-q", "-m", "initial", cwd=source)
+        git("-c", "protocol.file.allow=always", "submodule", "add", "-q", str(source), f"vendor/sub{index}", cwd=repo)
+        git("commit", "-q", "-m", f"add submodule {index}", cwd=repo)
+
+    for index in range(min(scenario.modified, scenario.tracked)):
+        path = repo / f"src{index // 100:04d}" / f"file{index:06d}.txt"
+        path.write_text("tracked\nmodified\n")
+    write_files(repo, "new", scenario.untracked, "untracked\n")
+    for index in range(scenario.submodules):
+        (repo / f"vendor/sub{index}" / "lib0000" / "file000000.txt").write_text("library\nmodified\n")
+    return repo
+
+
+def reset_state() -> None:
+    shutil.rmtree(guard.state_dir(), ignore_errors=True)
+
+
+def run_step(repo: Path, event: str, prompt: str) -> dict[str, float]:
+    global SPAWNED
+    payload = json.dumps({"hook_event_name": event, "cwd": str(repo), "session_id": "bench", "prompt": prompt})
+    saved = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(payload), io.StringIO(), io.StringIO()
+    # Each hook runs in a fresh process; only the daemon keeps remembered status between events.
+    guard.STATUS_MEMORY.clear()
+    SPAWNED = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        code = guard.main()
+    finally:
+        wall = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sys.stdin, sys.stdout, sys.stderr = saved
+    return {"wall_ms": wall * 1000, "subprocesses": SPAWNED, "peak_kib": peak / 1024, "exit_code": code}
+
+
+def summarize(samples: list[dict[str, float]]) -> dict[str, float]:
+    walls = sorted(sample["wall_ms"] for sample in samples)
+    return {
+        "wall_ms_median": round(statistics.median(walls), 2),
+        "wall_ms_p95": round(walls[max(0, round(0.95 * len(walls)) - 1)], 2),
+        "wall_ms_min": round(walls[0], 2),
+        "subprocesses": statistics.median(sample["subprocesses"] for sample in samples),
+        "peak_kib": round(max(sample["peak_kib"] for sample in samples), 1),
+        "exit_codes": sorted({sample["exit_code"] for sample in samples}),
+    }
+
+
+def bench_scenario(workdir: Path, scenario: Scenario, runs: int) -> dict[str, dict[str, float]]:
+    repo = build_repo(workdir, scenario)
+    samples: dict[str, list[dict[str, float]]] = {name: [] for name, _, _ in STEPS}
+    for _ in range(runs):
+        reset_state()
+        for name, event, prompt in STEPS:
+            samples[name].append(run_step(repo, event, prompt))
+    return {name: summarize(step_samples) for name, step_samples in samples.items()}
+
+
+def compare(results: dict[str, object], baseline: dict[str, object]) -> list[str]:
+    """Annotate each step with its baseline median and print the change."""
+    lines = []
+    base_scenarios = baseline.get("scenarios", {})
+    for name, scenario in results["scenarios"].items():
+        base_steps = base_scenarios.get(name, {}).get("steps", {})
+        for step, figures in scenario["steps"].items():
+            base = base_steps.get(step)
+            if not base or not base.get("wall_ms_median"):
+                continue
+            change = (figures["wall_ms_median"] - base["wall_ms_median"]) / base["wall_ms_median"] * 100
+            figures["baseline_wall_ms_median"] = base["wall_ms_median"]
+            figures["change_pct"] = round(change, 1)
+            lines.append(
+                f"{name:<8} {step:<20} {base['wall_ms_median']:>9.2f}ms -> {figures['wall_ms_median']:>9.2f}ms "
+                f"({change:+.1f}%)"
+            )
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure commit_pr_guard latency on generated git repos.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Preset to run (repeatable)")
+    parser.add_argument("--tracked", type=int, help="Run a custom scenario with this many tracked files")
+    parser.add_argument("--modified", type=int, default=10, help="Modified files for --tracked")
+    parser.add_argument("--untracked", type=int, default=10, help="Untracked files for --tracked")
+    parser.add_argument("--submodules", type=int, default=0, help="Submodules for --tracked")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated repos and print where they are")
+    args = parser.parse_args()
+
+    scenarios: dict[str, Scenario] = {name: SCENARIOS[name] for name in args.scenario or []}
+    if args.tracked is not None:
+        scenarios["custom"] = Scenario(args.tracked, args.modified, args.untracked, args.submodules)
+    if not scenarios:
+        scenarios = {"small": SCENARIOS["small"]}
+
+    workdir = Path(tempfile.mkdtemp(prefix="commit-pr-guard-bench-"))
+    # Keep the guard's state, the user's git config and telemetry out of the measurement.
+    os.environ.update(
+        {
+            "HOME": str(workdir / "home"),
+            "GIT_CONFIG_NOSYSTEM": "1",
+            "GIT_CONFIG_GLOBAL": os.devnull,
+            "COMMIT_PR_GUARD_TELEMETRY": "0",
+        }
+    )
+    sys.addaudithook(count_spawns)
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+
+    results: dict[str, object] = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": git_version,
+            "runs": args.runs,
+        },
+        "scenarios": {},
+    }
+    try:
+        for name, scenario in scenarios.items():
+            print(f"building and running {name}: {asdict(scenario)}", file=sys.stderr)
+            steps = bench_scenario(workdir / name, scenario, args.runs)
+            results["scenarios"][name] = {"config": asdict(scenario), "steps": steps}
+    finally:
+        if args.keep:
+            print(f"repos kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.baseline:
+        for line in compare(results, json.loads(args.baseline.read_text())):
+            print(line, file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
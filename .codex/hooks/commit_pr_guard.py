@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import asdict, dataclass, field, replace
 import hashlib
 import json
 import os
 from pathlib import Path
 import re
+import signal
+import sqlite3
 import subprocess
 import sys
+import threading
+import time
+from typing import Iterator, TextIO
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11: telemetry can still be enabled from the environment.
+    tomllib = None
 
 
 YES_PATTERNS = [
@@ -40,109 +54,846 @@ NO_PATTERNS = [
     r"\bdo not pr\b",
 ]
 
+# Searched separately, declines first: in one alternation an approval could consume words a
+# decline needs ("please do" in "please do not commit").
+NO_PATTERN = re.compile("|".join(NO_PATTERNS), re.IGNORECASE)
+YES_PATTERN = re.compile("|".join(YES_PATTERNS), re.IGNORECASE)
+# Only this many characters from each end of the prompt are scanned; pasted logs sit in between.
+PROMPT_SCAN_CHARS = 400
+FENCE = "```"
+# Lines that look pasted from a log or traceback: timestamps, level tags, stack frames.
+LOG_LINE = re.compile(
+    r"^[ \t]*(?:\d{4}-\d{2}-\d{2}[T ]\d|\[?\d{2}:\d{2}:\d{2}"
+    r"|\[?(?:TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b"
+    r"|Traceback \(most recent call last\)|File \"|at [\w$.<>]+\()[^\n]*$",
+    re.MULTILINE,
+)
+
+
+# COMMIT_PR_GUARD_* variables are read per event through setting(), from the hook's own
+# environment; commit_pr_guard_client.py forwards them to the daemon.
+SETTING_PREFIX = "COMMIT_PR_GUARD_"
+# Default for COMMIT_PR_GUARD_STATUS_TTL.
+STATUS_CACHE_TTL_SECONDS = 15.0
+STATE_TTL_SECONDS = 14 * 24 * 60 * 60
+# hooks.json gives each event 10 seconds; keep room for interpreter start and exit.
+# In-process default only: the client and daemon pass the budget to run_event.
+HOOK_BUDGET_SECONDS = float(os.environ.get("COMMIT_PR_GUARD_BUDGET", "8"))
+MIN_GIT_TIMEOUT_SECONDS = 0.05
+# Submodules and nested repositories are checked alongside the top-level repo.
+NESTED_REPO_WORKERS = 4
+MAX_NESTED_REPOS = 32
+# Git reports an untracked tree as its top directory, so its files are fingerprinted and
+# repos in it searched for, this many levels deep and across at most this many entries per status.
+UNTRACKED_SCAN_DEPTH = 3
+UNTRACKED_SCAN_ENTRIES = 2000
+# Default for COMMIT_PR_GUARD_TELEMETRY_MAX_BYTES.
+TELEMETRY_MAX_BYTES = 1024 * 1024
+
+
+class Deadline:
+    def __init__(self, budget: float) -> None:
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def share(self, fraction: float) -> float:
+        """Timeout for the next git call: a fraction of whatever time is left."""
+        return max(MIN_GIT_TIMEOUT_SECONDS, self.remaining() * fraction)
+
+
+def guard_environ() -> dict[str, str]:
+    return {name: value for name, value in os.environ.items() if name.startswith(SETTING_PREFIX)}
+
+
+@dataclass
+class EventContext:
+    deadline: Deadline = field(default_factory=lambda: Deadline(HOOK_BUDGET_SECONDS))
+    # The hook process's COMMIT_PR_GUARD_* variables, which may differ from the daemon's own.
+    env: dict[str, str] = field(default_factory=guard_environ)
+    # Telemetry for this event; git calls are appended from worker threads too.
+    started: float = field(default_factory=time.monotonic)
+    git_calls: list[tuple[str, float]] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    status: RepoStatus | None = None
+    outcome: str = ""
+
+    def record_git(self, args: tuple[str, ...] | list[str], started: float) -> None:
+        # Skip "-c key=value" overrides to name the subcommand.
+        index = 0
+        while index < len(args) and args[index] == "-c":
+            index += 2
+        name = args[index] if index < len(args) else "git"
+        self.git_calls.append((name, time.monotonic() - started))
+
+
+# Set per hook event by run_event; the daemon serves each event on its own thread.
+EVENT: ContextVar[EventContext] = ContextVar("commit_pr_guard_event")
+
+
+def current_event() -> EventContext:
+    try:
+        return EVENT.get()
+    except LookupError:
+        event = EventContext()
+        EVENT.set(event)
+        return event
+
+
+def setting(name: str, default: str = "") -> str:
+    """COMMIT_PR_GUARD_<name> from the current event's hook environment."""
+    return current_event().env.get(SETTING_PREFIX + name, default)
+
+
+def status_cache_ttl() -> float:
+    return float(setting("STATUS_TTL") or STATUS_CACHE_TTL_SECONDS)
+
+
+def run_git(*args: str, cwd: str, timeout: float) -> str:
+    started = time.monotonic()
+    try:
+        return subprocess.check_output(
+            ["git", *args],
+            cwd=cwd,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
+    finally:
+        current_event().record_git(args, started)
+
+
+@contextmanager
+def git_pipe(*args: str, cwd: str, timeout: float) -> Iterator[subprocess.Popen[bytes]]:
+    """Run git with stdout piped; kill it and raise TimeoutExpired if it outlives ``timeout``.
 
-def run_git(*args: str, cwd: str) -> str:
-    return subprocess.check_output(
+    git runs in its own process group so helpers it spawns die with it and
+    cannot keep the pipe open past the deadline.
+    """
+    expired = threading.Event()
+    started = time.monotonic()
+    with subprocess.Popen(
         ["git", *args],
         cwd=cwd,
+        stdout=subprocess.PIPE,
         stderr=subprocess.DEVNULL,
-        text=True,
-    )
+        start_new_session=True,
+    ) as proc:
+
+        def expire() -> None:
+            expired.set()
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(timeout, expire)
+        timer.start()
+        try:
+            yield proc
+        except BaseException:
+            if expired.is_set():
+                raise subprocess.TimeoutExpired(proc.args, timeout) from None
+            raise
+        finally:
+            timer.cancel()
+            current_event().record_git(args, started)
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(proc.args, timeout)
 
 
 def git_root(cwd: str) -> str | None:
     try:
-        return run_git("rev-parse", "--show-toplevel", cwd=cwd).strip()
-    except subprocess.CalledProcessError:
+        timeout = current_event().deadline.share(0.25)
+        return run_git("rev-parse", "--show-toplevel", cwd=cwd, timeout=timeout).strip()
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         return None
 
 
-def dirty_lines(cwd: str) -> list[str]:
-    output = run_git("status", "--porcelain=v1", cwd=cwd)
-    return [line for line in output.splitlines() if line]
+STATUS_CHUNK_BYTES = 64 * 1024
+
+# Root-relative pathspecs limiting which part of the tree is checked; empty means everything.
+Scope = tuple[str, ...]
+
+
+@dataclass
+class RepoStatus:
+    entries: int = 0
+    staged: int = 0
+    unstaged: int = 0
+    untracked: int = 0
+    ahead: int = 0
+    behind: int = 0
+    signature: str = ""
+    # Degraded answers when git ran out of time: untracked files skipped, or a reused old result.
+    partial: bool = False
+    stale: bool = False
+    # Pathspecs the check was limited to; empty means the whole tree.
+    scope: list[str] = field(default_factory=list)
+    # Untracked directories that are git repositories of their own, root-relative.
+    nested: list[str] = field(default_factory=list)
+    # Dirty submodules and nested repos keyed by path, and those that could not be checked in time.
+    # Only set on the combined result from current_status; never cached.
+    children: dict[str, RepoStatus] = field(default_factory=dict)
+    unchecked: list[str] = field(default_factory=list)
+
+    @property
+    def dirty(self) -> bool:
+        return self.entries > 0 or bool(self.children)
+
+    @property
+    def degraded(self) -> bool:
+        return (
+            self.partial
+            or self.stale
+            or bool(self.unchecked)
+            or any(child.degraded for child in self.children.values())
+        )
 
 
-def branch_status(cwd: str) -> tuple[int, int]:
+class StatusParser:
+    """Incremental parser for `git status --porcelain=v2 --branch -z` output.
+
+    Counts and the SHA-256 signature are updated one NUL-separated field at a
+    time, so memory stays constant however many paths are dirty. Rename/copy
+    entries ("2 ...") carry their original path as the next field, which is
+    folded into the same record.
+
+    Records already carry the index object id, so restaging changes them. For
+    paths modified in the worktree (and untracked paths) the signature also
+    folds in lstat mtime_ns and size, so further edits to an already-dirty
+    file change it without hashing contents.
+
+    Git collapses an untracked tree to one ``dir/`` record, whose lstat does
+    not change when a file inside it is edited. So each such directory is
+    walked (see ``scan_untracked``): its files' paths, mtimes and sizes go
+    into the signature, and repositories found in it are collected in
+    ``nested`` so current_status can check them too.
+    """
+
+    # Number of space-separated fields before the path, per record kind.
+    PATH_FIELD = {b"1": 8, b"2": 9, b"u": 10}
+
+    def __init__(self, root: str, scope: Scope = ()) -> None:
+        self.root = os.fsencode(root)
+        self.status = RepoStatus()
+        self.digest = hashlib.sha256()
+        for path in scope:
+            self.digest.update(os.fsencode(path) + b"\0")
+        self.expect_orig_path = False
+        self.scan_left = UNTRACKED_SCAN_ENTRIES
+
+    def feed(self, entry: bytes) -> None:
+        if self.expect_orig_path:
+            self.digest.update(b"\0" + entry)
+            self.expect_orig_path = False
+            return
+        if not entry:
+            return
+        if entry.startswith(b"# branch.ab "):
+            ahead, behind = entry[len(b"# branch.ab ") :].split()
+            self.status.ahead = int(ahead.lstrip(b"+"))
+            self.status.behind = int(behind.lstrip(b"-"))
+            return
+        if entry.startswith(b"#"):
+            return
+
+        kind = entry[:1]
+        if kind == b"!":
+            return
+        self.status.entries += 1
+        self.digest.update(b"\n" + entry)
+        if kind == b"2":
+            self.expect_orig_path = True
+        if kind == b"?":
+            self.status.untracked += 1
+            self.fingerprint(entry[2:])
+            if entry.endswith(b"/"):
+                self.scan_untracked(entry[2:-1])
+            return
+        if entry[2:3] != b".":
+            self.status.staged += 1
+        if entry[3:4] != b".":
+            self.status.unstaged += 1
+            self.fingerprint(entry.split(b" ", self.PATH_FIELD[kind])[-1])
+
+    def scan_untracked(self, directory: bytes) -> None:
+        """Breadth-first walk of an untracked directory, bounded in depth and entries.
+
+        Files are fingerprinted in name order so the signature does not depend
+        on directory listing order. Nested repositories are recorded, not entered.
+        """
+        level = [directory]
+        for depth in range(UNTRACKED_SCAN_DEPTH + 1):
+            below: list[bytes] = []
+            for path in level:
+                if os.path.lexists(os.path.join(self.root, path, b".git")):
+                    self.status.nested.append(os.fsdecode(path))
+                    continue
+                if depth == UNTRACKED_SCAN_DEPTH:
+                    continue
+                try:
+                    with os.scandir(os.path.join(self.root, path)) as listing:
+                        entries = sorted(listing, key=lambda entry: entry.name)
+                except OSError:
+                    continue
+                for entry in entries:
+                    if self.scan_left <= 0:
+                        return
+                    self.scan_left -= 1
+                    child = path + b"/" + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            below.append(child)
+                            continue
+                        info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    self.digest.update(b"\0%s\t%d:%d" % (child, info.st_mtime_ns, info.st_size))
+            level = below
+
+    def fingerprint(self, path: bytes) -> None:
+        try:
+            info = os.lstat(os.path.join(self.root, path))
+        except OSError:
+            self.digest.update(b"\t-")
+            return
+        self.digest.update(b"\t%d:%d" % (info.st_mtime_ns, info.st_size))
+
+    def finish(self) -> RepoStatus:
+        self.status.signature = self.digest.hexdigest()
+        return self.status
+
+
+def has_tracked_changes(root: str, scope: Scope = ()) -> bool | None:
+    """Return whether tracked files differ from HEAD, or None when HEAD cannot be compared."""
+    event = current_event()
+    started = time.monotonic()
     try:
-        line = run_git("status", "--porcelain=v1", "--branch", cwd=cwd).splitlines()[0]
-    except (IndexError, subprocess.CalledProcessError):
-        return (0, 0)
-
-    ahead_match = re.search(r"ahead (\d+)", line)
-    behind_match = re.search(r"behind (\d+)", line)
-    ahead = int(ahead_match.group(1)) if ahead_match else 0
-    behind = int(behind_match.group(1)) if behind_match else 0
-    return (ahead, behind)
-
-
-def dirty_summary(lines: list[str], cwd: str) -> str:
-    staged = 0
-    unstaged = 0
-    untracked = 0
-
-    for line in lines:
-        x = line[0]
-        y = line[1]
-        if x == "?" and y == "?":
-            untracked += 1
+        result = subprocess.run(
+            ["git", "diff-index", "--quiet", "--ignore-submodules=dirty", "HEAD", "--", *scope],
+            cwd=root,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=event.deadline.share(0.25),
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    finally:
+        event.record_git(["diff-index"], started)
+    if result.returncode == 0:
+        return False
+    if result.returncode == 1:
+        return True
+    return None
+
+
+def has_untracked(root: str, scope: Scope = ()) -> bool:
+    # Stop at the first byte of output instead of listing every untracked path.
+    with git_pipe(
+        "ls-files",
+        "--others",
+        "--exclude-standard",
+        "--directory",
+        "--no-empty-directory",
+        "-z",
+        "--",
+        *scope,
+        cwd=root,
+        timeout=current_event().deadline.share(0.25),
+    ) as proc:
+        assert proc.stdout is not None
+        found = bool(proc.stdout.read(1))
+        if found:
+            proc.kill()
+    return found
+
+
+def is_clean(root: str, scope: Scope = ()) -> bool:
+    """Cheap check that only proves cleanliness; a False result still needs a full status."""
+    if has_tracked_changes(root, scope) is not False:
+        return False
+    try:
+        return not has_untracked(root, scope)
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def status_perf_args() -> list[str]:
+    """Config overrides that keep repeated status calls cheap without touching the repo's config."""
+    args = ["-c", "core.untrackedCache=true"]
+    # The builtin fsmonitor daemon only exists on macOS and Windows.
+    if sys.platform in {"darwin", "win32"} and setting("FSMONITOR", "1") != "0":
+        args += ["-c", "core.fsmonitor=true"]
+    return args
+
+
+def repo_status(root: str, timeout: float, untracked: bool = True, scope: Scope = ()) -> RepoStatus:
+    parser = StatusParser(root, scope)
+    # Work inside submodules is reported by checking them directly, not through the gitlink.
+    args = [*status_perf_args(), "status", "--porcelain=v2", "--branch", "-z", "--ignore-submodules=dirty"]
+    if not untracked:
+        args.append("--untracked-files=no")
+    args += ["--", *scope]
+    with git_pipe(*args, cwd=root, timeout=timeout) as proc:
+        assert proc.stdout is not None
+        pending = b""
+        while chunk := proc.stdout.read(STATUS_CHUNK_BYTES):
+            *entries, pending = (pending + chunk).split(b"\0")
+            for entry in entries:
+                parser.feed(entry)
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, "git status")
+    parser.feed(pending)
+    status = parser.finish()
+    status.partial = not untracked
+    status.scope = list(scope)
+    return status
+
+
+def git_dir_for(root: str) -> Path:
+    dot_git = Path(root) / ".git"
+    if dot_git.is_file():
+        # Linked worktrees and submodules use a "gitdir: <path>" pointer file.
+        target = dot_git.read_text().strip().removeprefix("gitdir:").strip()
+        return (Path(root) / target).resolve()
+    return dot_git
+
+
+def head_oid(git_dir: Path) -> str:
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return ""
+    if not head.startswith("ref: "):
+        return head
+
+    ref = head[len("ref: ") :]
+    common_dir = git_dir
+    try:
+        common_dir = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+    except OSError:
+        pass
+
+    for base in (git_dir, common_dir):
+        try:
+            return (base / ref).read_text().strip()
+        except OSError:
             continue
-        if x != " ":
-            staged += 1
-        if y != " ":
-            unstaged += 1
 
-    ahead, behind = branch_status(cwd)
-    return (
-        f"{staged} staged, {unstaged} unstaged, {untracked} untracked, "
-        f"{ahead} ahead, {behind} behind"
-    )
+    try:
+        packed = (common_dir / "packed-refs").read_text()
+    except OSError:
+        return head
+    for line in packed.splitlines():
+        if line.endswith(f" {ref}"):
+            return line.split(" ", 1)[0]
+    return head
 
 
-def signature(lines: list[str]) -> str:
-    joined = "\n".join(lines)
-    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+def status_cache_key(root: str, scope: Scope = ()) -> list[object]:
+    git_dir = git_dir_for(root)
+    try:
+        index = (git_dir / "index").stat()
+        index_key: list[int] = [index.st_mtime_ns, index.st_size, index.st_ino]
+    except OSError:
+        index_key = []
+    return [index_key, head_oid(git_dir), list(scope)]
 
 
-def state_file_for(root: str) -> Path:
-    repo_key = hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
-    state_dir = Path.home() / ".codex" / ".tmp" / "commit-pr-guard"
-    state_dir.mkdir(parents=True, exist_ok=True)
-    return state_dir / f"{repo_key}.json"
+# Only outlives a single event inside commit_pr_guard_daemon.py.
+STATUS_MEMORY: dict[tuple[str, Scope], tuple[list[object], float, RepoStatus]] = {}
 
 
-def load_state(path: Path) -> dict[str, str]:
-    try:
-        return json.loads(path.read_text())
-    except FileNotFoundError:
-        return {}
-    except json.JSONDecodeError:
-        return {}
+def remembered_status(root: str, scope: Scope, key: list[object]) -> RepoStatus | None:
+    remembered = STATUS_MEMORY.get((root, scope))
+    if remembered is None:
+        return None
+    remembered_key, created, status = remembered
+    if remembered_key != key or time.time() - created > status_cache_ttl():
+        return None
+    return status
+
+
+def cached_status(root: str, store: StateStore, scope: Scope) -> RepoStatus | None:
+    key = status_cache_key(root, scope)
+    status = remembered_status(root, scope, key) or store.load_status(root, key)
+    event = current_event()
+    if status is None:
+        event.cache_misses += 1
+    else:
+        event.cache_hits += 1
+    return status
+
 
+def remember_status(root: str, store: StateStore, scope: Scope, status: RepoStatus) -> None:
+    # Key on the post-status index: status may refresh the index and rewrite it.
+    key = status_cache_key(root, scope)
+    STATUS_MEMORY[(root, scope)] = (key, time.time(), status)
+    store.save_status(root, key, status)
 
-def save_state(path: Path, state: dict[str, str]) -> None:
-    path.write_text(json.dumps(state, sort_keys=True))
 
+def check_repo(root: str, scope: Scope) -> RepoStatus | None:
+    """Compute one repo's status without touching the state store, so it can run on a worker thread.
 
-def clear_state(path: Path) -> None:
+    The full status gets part of the remaining time; if that runs out, a
+    tracked-only status gets most of the rest. None means both timed out.
+    """
+    if is_clean(root, scope):
+        return RepoStatus(scope=list(scope))
+    deadline = current_event().deadline
     try:
-        path.unlink()
-    except FileNotFoundError:
+        return repo_status(root, timeout=deadline.share(0.6), scope=scope)
+    except subprocess.TimeoutExpired:
         pass
+    try:
+        return repo_status(root, timeout=deadline.share(0.8), untracked=False, scope=scope)
+    except subprocess.TimeoutExpired:
+        return None
 
 
-def classify_prompt(prompt: str) -> str | None:
-    text = prompt.strip().lower()
-    if not text:
-        return None
+def submodule_paths(root: str) -> list[str]:
+    """Paths of checked-out submodules from .gitmodules; uninitialised ones have nothing to check."""
+    try:
+        text = (Path(root) / ".gitmodules").read_text()
+    except OSError:
+        return []
+    paths = []
+    for match in re.finditer(r"^\s*path\s*=\s*(.+?)\s*$", text, re.MULTILINE):
+        path = match.group(1)
+        if os.path.lexists(os.path.join(root, path, ".git")):
+            paths.append(path)
+    return paths
+
+
+def enclosing_repo_paths(root: str, scope: Scope) -> list[str]:
+    """Nested repos that scope paths point into; the top-level status never lists their contents."""
+    paths = []
+    for spec in scope:
+        parts = spec.split("/")
+        for depth in range(1, len(parts)):
+            path = "/".join(parts[:depth])
+            if os.path.lexists(os.path.join(root, path, ".git")):
+                paths.append(path)
+    return paths
+
+
+def nested_scope(scope: Scope, path: str) -> Scope | None:
+    """The part of ``scope`` inside the nested repo at ``path``, relative to it; None if none is."""
+    if not scope:
+        return ()
+    inner = []
+    for spec in scope:
+        if spec == path or path.startswith(spec + "/"):
+            return ()
+        if spec.startswith(path + "/"):
+            inner.append(spec[len(path) + 1 :])
+    return tuple(inner) or None
+
+
+def current_status(root: str, store: StateStore, scope: Scope = (), use_cache: bool = True) -> RepoStatus | None:
+    """Return the dirty state of ``root`` and its submodules and nested repos.
+
+    Fresh cached results for the same index and HEAD are reused as is unless
+    ``use_cache`` is False; the rest are checked concurrently on a small thread pool, so the total takes
+    about as long as the slowest repo. Submodules start with the top-level
+    check; nested repos start as soon as the status that found them is in.
+    Nothing outlives the hook deadline: a top-level check that runs out of
+    time falls back to the last cached result marked stale, and nested repos
+    still running are listed as unchecked. None means nothing could be
+    determined for the top-level repo.
+    """
+    deadline = current_event().deadline
+    results: dict[str, RepoStatus | None] = {}
+    pending: dict[Future[RepoStatus | None], tuple[str, Scope]] = {}
+    pool = ThreadPoolExecutor(max_workers=NESTED_REPO_WORKERS, thread_name_prefix="commit-pr-guard")
+
+    def visit(path: str, path_scope: Scope) -> None:
+        repo = os.path.join(root, path) if path else root
+        for submodule in submodule_paths(repo):
+            queue(os.path.join(path, submodule) if path else submodule)
+        status = cached_status(repo, store, path_scope) if use_cache else None
+        if status is not None:
+            finish(path, status)
+            return
+        # Each task needs its own copy: one context cannot be entered on two threads at once.
+        pending[pool.submit(copy_context().run, check_repo, repo, path_scope)] = (path, path_scope)
+
+    def queue(path: str) -> None:
+        path = Path(path).as_posix()
+        path_scope = nested_scope(scope, path)
+        known = len(results) + len(pending)
+        if path_scope is None or path in results or known >= MAX_NESTED_REPOS:
+            return
+        if any(queued == path for queued, _ in pending.values()):
+            return
+        visit(path, path_scope)
+
+    def finish(path: str, status: RepoStatus | None) -> None:
+        results[path] = status
+        for nested in status.nested if status else []:
+            queue(f"{path}/{nested}" if path else nested)
 
-    for pattern in NO_PATTERNS:
-        if re.search(pattern, text):
-            return "declined"
+    try:
+        visit("", scope)
+        for path in enclosing_repo_paths(root, scope):
+            queue(path)
+        while pending:
+            done, _ = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                path, path_scope = pending.pop(future)
+                try:
+                    status = future.result()
+                except (subprocess.SubprocessError, OSError):
+                    status = None
+                if status is not None and status.entries and not status.partial:
+                    # Clean results are cheap to recompute and must not hide edits made within the TTL.
+                    remember_status(os.path.join(root, path) if path else root, store, path_scope, status)
+                finish(path, status)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    for path, _ in pending.values():
+        results[path] = None
+
+    top = results.pop("", None)
+    if top is None:
+        top = store.load_status(root, None)
+        if top is None:
+            return None
+        top.stale = True
+
+    children = {path: status for path, status in results.items() if status is not None and status.dirty}
+    unchecked = sorted(path for path, status in results.items() if status is None)
+    if not children and not unchecked:
+        return top
+    signature = top.signature
+    if children:
+        digest = hashlib.sha256(top.signature.encode())
+        for path in sorted(children):
+            digest.update(f"\0{path}\0{children[path].signature}".encode())
+        signature = digest.hexdigest()
+    return replace(top, children=children, unchecked=unchecked, signature=signature)
+
+
+def dirty_summary(status: RepoStatus) -> str:
+    summary = (
+        f"{status.staged} staged, {status.unstaged} unstaged, {status.untracked} untracked, "
+        f"{status.ahead} ahead, {status.behind} behind"
+    )
+    for path in sorted(status.children)[:5]:
+        child = status.children[path]
+        note = ", incomplete" if child.degraded else ""
+        summary = (
+            f"{summary}; {path}: {child.staged} staged, {child.unstaged} unstaged, "
+            f"{child.untracked} untracked{note}"
+        )
+    if len(status.children) > 5:
+        summary = f"{summary}; {len(status.children) - 5} more dirty nested repos"
+    if status.unchecked:
+        summary = f"{summary}; timed out checking {', '.join(status.unchecked[:3])}"
+        if len(status.unchecked) > 3:
+            summary = f"{summary} (+{len(status.unchecked) - 3} more)"
+    if status.scope:
+        shown = ", ".join(status.scope[:3])
+        more = f" (+{len(status.scope) - 3} more)" if len(status.scope) > 3 else ""
+        summary = f"{summary}; limited to {shown}{more}"
+    if status.stale:
+        return f"{summary}; git status timed out, figures are from an earlier check"
+    if status.partial:
+        return f"{summary}; git status timed out, untracked files were not checked"
+    return summary
+
+
+def state_dir() -> Path:
+    path = Path.home() / ".codex" / ".tmp" / "commit-pr-guard"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def repo_key_for(root: str) -> str:
+    return hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
+
+
+class StateStore:
+    """Decision and status-cache rows in one SQLite database (WAL mode).
+
+    Decisions are keyed by repo and hook session, so parallel sessions on the
+    same repo keep separate answers. Read-modify-write sequences run inside
+    ``transaction()``, which takes the write lock up front. Lock waits are
+    bounded by the event deadline; sqlite3.OperationalError ("database is
+    locked") means the lock was not free in time, and run_event degrades.
+    """
+
+    SCHEMA_VERSION = 1
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS decisions (
+            repo_key TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            decision TEXT NOT NULL,
+            signature TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (repo_key, session_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS decisions_updated_at ON decisions (updated_at)",
+        """
+        CREATE TABLE IF NOT EXISTS status_cache (
+            repo_key TEXT PRIMARY KEY,
+            cache_key TEXT NOT NULL,
+            created REAL NOT NULL,
+            status TEXT NOT NULL
+        )
+        """,
+    ]
+
+    def __init__(self, path: Path) -> None:
+        self.db = sqlite3.connect(path, timeout=current_event().deadline.remaining(), isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self.migrate(path.parent)
+
+    def migrate(self, legacy_dir: Path) -> None:
+        with self.transaction():
+            if self.db.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+            for statement in self.SCHEMA:
+                self.db.execute(statement)
+            # Per-repo JSON files from earlier versions are dropped, not imported: they carry no
+            # session id, and their signatures predate the porcelain v2 format, so none could match.
+            for legacy in legacy_dir.glob("*.json"):
+                legacy.unlink(missing_ok=True)
+            self.db.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+    def bound_lock_wait(self) -> None:
+        """Wait for a contended write lock no longer than the event has left."""
+        self.db.execute(f"PRAGMA busy_timeout={int(current_event().deadline.remaining() * 1000)}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        self.bound_lock_wait()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def load(self, root: str, session_id: str) -> dict[str, str]:
+        row = self.db.execute(
+            "SELECT decision, signature FROM decisions WHERE repo_key = ? AND session_id = ?",
+            (repo_key_for(root), session_id),
+        ).fetchone()
+        return {"decision": row[0], "signature": row[1]} if row else {}
+
+    def save(self, root: str, session_id: str, state: dict[str, str]) -> None:
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?)",
+            (repo_key_for(root), session_id, state["decision"], state["signature"], now),
+        )
+        self.db.execute("DELETE FROM decisions WHERE updated_at < ?", (now - STATE_TTL_SECONDS,))
+
+    def clear(self, root: str, session_id: str | None = None) -> None:
+        """Forget decisions for the repo, or only for one session when its check was scoped."""
+        repo_key = repo_key_for(root)
+        with self.transaction():
+            if session_id is not None:
+                self.db.execute(
+                    "DELETE FROM decisions WHERE repo_key = ? AND session_id = ?", (repo_key, session_id)
+                )
+                return
+            self.db.execute("DELETE FROM decisions WHERE repo_key = ?", (repo_key,))
+            self.db.execute("DELETE FROM status_cache WHERE repo_key = ?", (repo_key,))
+
+    def load_status(self, root: str, key: list[object] | None) -> RepoStatus | None:
+        row = self.db.execute(
+            "SELECT cache_key, created, status FROM status_cache WHERE repo_key = ?",
+            (repo_key_for(root),),
+        ).fetchone()
+        if row is None:
+            return None
+        # key=None asks for the last result regardless of age, as a deadline fallback.
+        if key is not None and (row[0] != json.dumps(key) or time.time() - row[1] > status_cache_ttl()):
+            return None
+        try:
+            return RepoStatus(**json.loads(row[2]))
+        except (TypeError, json.JSONDecodeError):
+            return None
+
+    def save_status(self, root: str, key: list[object], status: RepoStatus) -> None:
+        now = time.time()
+        self.bound_lock_wait()
+        self.db.execute(
+            "INSERT OR REPLACE INTO status_cache VALUES (?, ?, ?, ?)",
+            (repo_key_for(root), json.dumps(key), now, json.dumps(asdict(status))),
+        )
+        self.db.execute("DELETE FROM status_cache WHERE created < ?", (now - STATE_TTL_SECONDS,))
 
-    for pattern in YES_PATTERNS:
-        if re.search(pattern, text):
-            return "approved"
+    def close(self) -> None:
+        self.db.close()
 
+
+def open_state_store() -> StateStore:
+    return StateStore(state_dir() / "state.sqlite3")
+
+
+def unfenced(text: str, inside: bool = False) -> str:
+    """Drop fenced code blocks; ``inside`` says the text starts within an open fence."""
+    parts = text.split(FENCE)
+    start = 1 if inside else 0
+    return " ".join(parts[start::2])
+
+
+def partial_word_end(text: str) -> int:
+    match = re.search(r"\s\S*\Z", text)
+    return match.start() if match else 0
+
+
+def partial_word_start(text: str) -> int:
+    match = re.search(r"\s", text)
+    return match.start() if match else len(text)
+
+
+def after_last_log_line(text: str) -> str:
+    last = None
+    for last in LOG_LINE.finditer(text):
+        pass
+    return text[last.end() :] if last else text
+
+
+def prompt_window(prompt: str) -> str:
+    """The user's own words: the start and end of the prompt, outside fenced blocks and log lines.
+
+    Long prompts are cut to PROMPT_SCAN_CHARS from each end, trimmed back to
+    whole words, so the middle of a large paste is never scanned. Whether the
+    tail starts inside a fence is decided by counting fences before it. Lines
+    that look like an unfenced log (LOG_LINE) are dropped, and the tail keeps
+    only what follows its last log line, since it may start mid-line in the
+    paste. Pastes without such markers are still scanned.
+    """
+    if len(prompt) <= 2 * PROMPT_SCAN_CHARS:
+        return LOG_LINE.sub("", unfenced(prompt))
+    head = prompt[:PROMPT_SCAN_CHARS]
+    head = head[: partial_word_end(head)]
+    tail = prompt[-PROMPT_SCAN_CHARS:]
+    tail = tail[partial_word_start(tail) :]
+    tail_inside = prompt.count(FENCE, 0, len(prompt) - len(tail)) % 2 == 1
+    return f"{LOG_LINE.sub('', unfenced(head))}\n{after_last_log_line(unfenced(tail, inside=tail_inside))}"
+
+
+def classify_prompt(prompt: str) -> str | None:
+    window = prompt_window(prompt)
+    if NO_PATTERN.search(window):
+        return "declined"
+    if YES_PATTERN.search(window):
+        return "approved"
     return None
 
 
@@ -183,86 +934,239 @@ DECLINED_CONTEXT = (
 )
 
 
-def handle_stop(payload: dict[str, object], cwd: str, state_path: Path) -> int:
-    root = git_root(cwd)
-    if root is None:
-        return 0
+def session_id_for(payload: dict[str, object]) -> str:
+    return str(payload.get("session_id") or "")
+
 
-    lines = dirty_lines(root)
-    if not lines:
-        clear_state(state_path)
+def sparse_checkout_cone(root: str) -> list[str]:
+    try:
+        output = run_git("sparse-checkout", "list", cwd=root, timeout=current_event().deadline.share(0.1))
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return []
+    return output.splitlines()
+
+
+def resolve_scope(payload: dict[str, object], root: str) -> Scope:
+    """Pick the paths to check, most specific source first.
+
+    1. ``scope_paths`` in the hook payload (absolute or root-relative).
+    2. The file named by COMMIT_PR_GUARD_SCOPE_FILE, one path per line;
+       ``{session_id}`` in the name is replaced with the hook session id.
+    3. The sparse-checkout cone when COMMIT_PR_GUARD_SCOPE=sparse.
+
+    Without any of these the whole tree is checked.
+    """
+    raw_paths: list[str] = []
+    payload_paths = payload.get("scope_paths")
+    scope_file = setting("SCOPE_FILE")
+    if isinstance(payload_paths, list):
+        raw_paths = [str(path) for path in payload_paths]
+    elif scope_file:
+        try:
+            text = Path(scope_file.replace("{session_id}", session_id_for(payload))).expanduser().read_text()
+        except OSError:
+            text = ""
+        raw_paths = text.splitlines()
+    elif setting("SCOPE") == "sparse":
+        raw_paths = sparse_checkout_cone(root)
+
+    scope: set[str] = set()
+    for raw_path in raw_paths:
+        raw_path = raw_path.strip()
+        if not raw_path:
+            continue
+        relative = os.path.relpath(os.path.join(root, raw_path), root)
+        if relative == ".":
+            return ()
+        if relative == ".." or relative.startswith(".." + os.sep):
+            continue
+        scope.add(Path(relative).as_posix())
+    return tuple(sorted(scope))
+
+
+def handle_stop(payload: dict[str, object], root: str, store: StateStore, out: TextIO, err: TextIO) -> int:
+    event = current_event()
+    scope = resolve_scope(payload, root)
+    # Edits to already-dirty files leave the cache key (index stat, HEAD) alone,
+    # so a cached status could hide the change that should end a decline.
+    declined = store.load(root, session_id_for(payload)).get("decision") == "declined"
+    status = event.status = current_status(root, store, scope, use_cache=not declined)
+    if status is None:
+        event.outcome = "timed_out"
+        print("commit_pr_guard: git status timed out; not blocking this stop.", file=err)
+        return 0
+    if not status.dirty:
+        event.outcome = "clean"
+        if not status.degraded:
+            store.clear(root, session_id_for(payload) if scope else None)
         return 0
 
     if payload.get("stop_hook_active") is True:
+        event.outcome = "stop_hook_active"
         return 0
 
-    state = load_state(state_path)
-    current_signature = signature(lines)
+    session_id = session_id_for(payload)
+    current_signature = status.signature
 
-    if state.get("decision") == "approved":
-        print(approved_stop_message(dirty_summary(lines, root)), file=sys.stderr)
-        return 2
+    with store.transaction():
+        state = store.load(root, session_id)
 
-    if (
-        state.get("decision") == "declined"
-        and state.get("signature") == current_signature
-    ):
-        return 0
+        if state.get("decision") == "approved":
+            event.outcome = "continue_approved"
+            print(approved_stop_message(dirty_summary(status)), file=err)
+            return 2
 
-    next_state = {
-        "decision": "awaiting_user",
-        "signature": current_signature,
-    }
-    save_state(state_path, next_state)
-    print(stop_message(dirty_summary(lines, root)), file=sys.stderr)
-    return 2
+        # A degraded signature cannot prove the dirty state changed, so keep honouring the decline.
+        if state.get("decision") == "declined" and (
+            status.degraded or state.get("signature") == current_signature
+        ):
+            event.outcome = "declined"
+            return 0
 
+        next_state = {
+            "decision": "awaiting_user",
+            "signature": current_signature,
+        }
+        store.save(root, session_id, next_state)
 
-def handle_user_prompt_submit(payload: dict[str, object], cwd: str, state_path: Path) -> int:
-    root = git_root(cwd)
-    if root is None:
-        return 0
-
-    lines = dirty_lines(root)
-    if not lines:
-        clear_state(state_path)
-        return 0
+    event.outcome = "asked"
+    print(stop_message(dirty_summary(status)), file=err)
+    return 2
 
-    state = load_state(state_path)
-    current_signature = signature(lines)
 
-    if state.get("decision") != "awaiting_user":
+def handle_user_prompt_submit(
+    payload: dict[str, object], root: str, store: StateStore, out: TextIO, err: TextIO
+) -> int:
+    event = current_event()
+    scope = resolve_scope(payload, root)
+    status = event.status = current_status(root, store, scope)
+    if status is None:
+        event.outcome = "timed_out"
         return 0
-
-    if state.get("signature") != current_signature:
+    if not status.dirty:
+        event.outcome = "clean"
+        if not status.degraded:
+            store.clear(root, session_id_for(payload) if scope else None)
         return 0
 
-    decision = classify_prompt(str(payload.get("prompt") or ""))
-    if decision == "approved":
-        save_state(
-            state_path,
-            {
-                "decision": "approved",
-                "signature": current_signature,
-            },
-        )
-        print(APPROVED_CONTEXT)
-    elif decision == "declined":
-        save_state(
-            state_path,
-            {
-                "decision": "declined",
-                "signature": current_signature,
-            },
-        )
-        print(DECLINED_CONTEXT)
+    session_id = session_id_for(payload)
+
+    with store.transaction():
+        state = store.load(root, session_id)
+
+        if state.get("decision") != "awaiting_user":
+            event.outcome = "not_asked"
+            return 0
+
+        # Keep the signature the question was asked about when this check was degraded.
+        current_signature = state.get("signature", "") if status.degraded else status.signature
+        if state.get("signature") != current_signature:
+            event.outcome = "changed_since_asked"
+            return 0
+
+        decision = classify_prompt(str(payload.get("prompt") or ""))
+        event.outcome = decision or "unclassified"
+        if decision == "approved":
+            store.save(
+                root,
+                session_id,
+                {
+                    "decision": "approved",
+                    "signature": current_signature,
+                },
+            )
+            print(APPROVED_CONTEXT, file=out)
+        elif decision == "declined":
+            store.save(
+                root,
+                session_id,
+                {
+                    "decision": "declined",
+                    "signature": current_signature,
+                },
+            )
+            print(DECLINED_CONTEXT, file=out)
 
     return 0
 
 
-def main() -> int:
+def load_guard_config(root: str) -> dict[str, object]:
+    """The [commit_pr_guard] table from ~/.codex/config.toml, overridden by the repo's .codex/config.toml."""
+    config: dict[str, object] = {}
+    if tomllib is None:
+        return config
+    for path in (Path.home() / ".codex" / "config.toml", Path(root) / ".codex" / "config.toml"):
+        try:
+            with path.open("rb") as handle:
+                table = tomllib.load(handle).get("commit_pr_guard")
+        except (OSError, tomllib.TOMLDecodeError):
+            continue
+        if isinstance(table, dict):
+            config.update(table)
+    return config
+
+
+def telemetry_enabled(root: str) -> bool:
+    """COMMIT_PR_GUARD_TELEMETRY=1/0 wins; otherwise ``telemetry = true`` under [commit_pr_guard]."""
+    value = current_event().env.get(SETTING_PREFIX + "TELEMETRY")
+    if value is not None:
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return load_guard_config(root).get("telemetry") is True
+
+
+def telemetry_path() -> Path:
+    return state_dir() / "telemetry.jsonl"
+
+
+def telemetry_record(event_name: str, root: str, code: int, event: EventContext) -> dict[str, object]:
+    status = event.status
+    record: dict[str, object] = {
+        "ts": round(time.time(), 3),
+        "event": event_name,
+        "repo": root,
+        "ms": round((time.monotonic() - event.started) * 1000, 2),
+        "git": [[name, round(seconds * 1000, 2)] for name, seconds in event.git_calls],
+        "cache_hits": event.cache_hits,
+        "cache_misses": event.cache_misses,
+        "outcome": event.outcome,
+        "code": code,
+    }
+    if status is not None:
+        record["counts"] = {
+            "staged": status.staged,
+            "unstaged": status.unstaged,
+            "untracked": status.untracked,
+            "nested_dirty": len(status.children),
+        }
+        record["degraded"] = status.degraded
+    return record
+
+
+def write_telemetry(record: dict[str, object]) -> None:
+    """Append one line, moving the log to ``.1`` first once it passes COMMIT_PR_GUARD_TELEMETRY_MAX_BYTES."""
+    path = telemetry_path()
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
     try:
-        payload = json.loads(sys.stdin.read() or "{}")
+        if path.stat().st_size + len(line) > int(setting("TELEMETRY_MAX_BYTES") or TELEMETRY_MAX_BYTES):
+            os.replace(path, path.with_name(path.name + ".1"))
+    except FileNotFoundError:
+        pass
+    # A single O_APPEND write keeps lines whole when the daemon and hook processes both log.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def run_event(
+    raw: str, out: TextIO, err: TextIO, budget: float = HOOK_BUDGET_SECONDS, env: dict[str, str] | None = None
+) -> int:
+    """Handle one hook event; ``env`` holds the hook's COMMIT_PR_GUARD_* variables (default: this process's)."""
+    event = EventContext(deadline=Deadline(budget), env=guard_environ() if env is None else env)
+    EVENT.set(event)
+    try:
+        payload = json.loads(raw or "{}")
     except json.JSONDecodeError:
         return 0
 
@@ -271,14 +1175,37 @@ def main() -> int:
     if root is None:
         return 0
 
-    state_path = state_file_for(root)
     event_name = payload.get("hook_event_name")
+    if event_name not in {"Stop", "UserPromptSubmit"}:
+        return 0
 
-    if event_name == "Stop":
-        return handle_stop(payload, cwd, state_path)
-    if event_name == "UserPromptSubmit":
-        return handle_user_prompt_submit(payload, cwd, state_path)
-    return 0
+    store = None
+    try:
+        store = open_state_store()
+        if event_name == "Stop":
+            code = handle_stop(payload, root, store, out, err)
+        else:
+            code = handle_user_prompt_submit(payload, root, store, out, err)
+    except sqlite3.OperationalError:
+        # Another hook held the state lock past the deadline; answer in time without a decision.
+        event.outcome = "state_locked"
+        code = 0
+        if event_name == "Stop":
+            print("commit_pr_guard: state store is busy; not blocking this stop.", file=err)
+    finally:
+        if store is not None:
+            store.close()
+
+    if telemetry_enabled(root):
+        try:
+            write_telemetry(telemetry_record(str(event_name), root, code, event))
+        except OSError:
+            pass
+    return code
+
+
+def main() -> int:
+    return run_event(sys.stdin.read(), sys.stdout, sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Thin hook entry point: ask commit_pr_guard_daemon.py, else run commit_pr_guard in-process."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+
+
+STARTED = time.monotonic()
+DAEMON_TIMEOUT_SECONDS = 6.0
+# Matches commit_pr_guard.HOOK_BUDGET_SECONDS without importing it on the fast path.
+HOOK_BUDGET_SECONDS = float(os.environ.get("COMMIT_PR_GUARD_BUDGET", "8"))
+
+
+def socket_path() -> str:
+    return os.environ.get("COMMIT_PR_GUARD_SOCKET") or os.path.expanduser(
+        "~/.codex/.tmp/commit-pr-guard/daemon.sock"
+    )
+
+
+def request_header() -> bytes:
+    """First request line: this hook's COMMIT_PR_GUARD_* settings, which the daemon's environment lacks."""
+    env = {name: value for name, value in os.environ.items() if name.startswith("COMMIT_PR_GUARD_")}
+    return json.dumps({"env": env}).encode("utf-8") + b"\n"
+
+
+def via_daemon(raw: bytes) -> int | None:
+    chunks: list[bytes] = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT_SECONDS)
+            sock.connect(socket_path())
+            sock.sendall(request_header())
+            sock.sendall(raw)
+            sock.shutdown(socket.SHUT_WR)
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    try:
+        reply = json.loads(b"".join(chunks))
+    except ValueError:
+        return None
+    if not isinstance(reply, dict) or reply.get("fallback"):
+        return None
+
+    sys.stdout.write(str(reply.get("stdout") or ""))
+    sys.stderr.write(str(reply.get("stderr") or ""))
+    return int(reply.get("code") or 0)
+
+
+def main() -> int:
+    raw = sys.stdin.buffer.read()
+    # The daemon has its own working directory, so only forward payloads that name theirs.
+    code = via_daemon(raw) if b'"cwd"' in raw else None
+    if code is not None:
+        return code
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import commit_pr_guard
+
+    budget = max(0.5, HOOK_BUDGET_SECONDS - (time.monotonic() - STARTED))
+    return commit_pr_guard.run_event(raw.decode("utf-8", errors="replace"), sys.stdout, sys.stderr, budget)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
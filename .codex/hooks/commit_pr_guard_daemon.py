@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Resident per-user server for commit_pr_guard hook events.
+
+Start it once per login session; it exits on its own after being idle:
+
+    .codex/hooks/commit_pr_guard_daemon.py &
+
+commit_pr_guard_client.py forwards each hook event over a Unix socket and
+falls back to running commit_pr_guard in-process when nothing is listening.
+Each request is one JSON line with the hook's COMMIT_PR_GUARD_* variables,
+followed by the raw hook payload; settings come from that line, not from
+the daemon's own environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+from pathlib import Path
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import commit_pr_guard as guard  # noqa: E402
+
+
+IDLE_EXIT_SECONDS = 30 * 60
+WATCH_INTERVAL_SECONDS = 1.0
+MAX_REQUEST_BYTES = 32 * 1024 * 1024
+# Stay inside the client's wait so it never has to fall back on a slow answer.
+EVENT_BUDGET_SECONDS = 5.5
+
+
+def socket_path() -> Path:
+    override = os.environ.get("COMMIT_PR_GUARD_SOCKET")
+    return Path(override) if override else guard.state_dir() / "daemon.sock"
+
+
+def source_mtimes() -> list[int]:
+    client = Path(__file__).with_name("commit_pr_guard_client.py")
+    return [Path(path).stat().st_mtime_ns for path in (guard.__file__, __file__, client)]
+
+
+class GuardServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(str(path), GuardHandler)
+        self.started_sources = source_mtimes()
+        self.last_request = time.monotonic()
+
+    def sources_changed(self) -> bool:
+        try:
+            return source_mtimes() != self.started_sources
+        except OSError:
+            return True
+
+
+class GuardHandler(socketserver.StreamRequestHandler):
+    server: GuardServer
+
+    def handle(self) -> None:
+        self.server.last_request = time.monotonic()
+        raw = self.rfile.read(MAX_REQUEST_BYTES + 1)
+        if len(raw) > MAX_REQUEST_BYTES or self.server.sources_changed():
+            # Let the client run the current code in-process; restart picks up edits.
+            self.reply({"fallback": True})
+            if self.server.sources_changed():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        header, _, payload = raw.partition(b"\n")
+        try:
+            env = json.loads(header)["env"]
+        except (ValueError, KeyError, TypeError):
+            env = None
+        if not isinstance(env, dict):
+            self.reply({"fallback": True})
+            return
+
+        out = io.StringIO()
+        err = io.StringIO()
+        try:
+            budget = min(EVENT_BUDGET_SECONDS, float(env.get("COMMIT_PR_GUARD_BUDGET") or EVENT_BUDGET_SECONDS))
+            code = guard.run_event(payload.decode("utf-8", errors="replace"), out, err, budget=budget, env=env)
+        except Exception:
+            self.reply({"fallback": True})
+            return
+        self.reply({"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()})
+
+    def reply(self, message: dict[str, object]) -> None:
+        try:
+            self.wfile.write(json.dumps(message).encode("utf-8"))
+        except OSError:
+            pass
+
+
+def watch(server: GuardServer, idle_exit: float) -> None:
+    """Drop remembered status once .git/index or HEAD moves, and stop the server when idle."""
+    while True:
+        time.sleep(WATCH_INTERVAL_SECONDS)
+        for (root, scope), (key, created, _status) in list(guard.STATUS_MEMORY.items()):
+            # Each event applies its own COMMIT_PR_GUARD_STATUS_TTL on read; this only bounds memory.
+            expired = time.time() - created > guard.STATUS_CACHE_TTL_SECONDS
+            if expired or guard.status_cache_key(root, scope) != key:
+                guard.STATUS_MEMORY.pop((root, scope), None)
+        if time.monotonic() - server.last_request > idle_exit:
+            server.shutdown()
+            return
+
+
+def claim_socket(path: Path) -> bool:
+    if not path.exists():
+        return True
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return True
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve commit_pr_guard hook events over a Unix socket.")
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT_SECONDS, help="Seconds idle before exiting")
+    args = parser.parse_args()
+
+    path = socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not claim_socket(path):
+        print(f"commit_pr_guard daemon already listening on {path}", file=sys.stderr)
+        return 0
+
+    old_umask = os.umask(0o077)
+    try:
+        server = GuardServer(path)
+    finally:
+        os.umask(old_umask)
+
+    threading.Thread(target=watch, args=(server, args.idle_exit), daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Summarize commit_pr_guard telemetry: latency percentiles per repo.
+
+Enable logging with COMMIT_PR_GUARD_TELEMETRY=1, or in .codex/config.toml:
+
+    [commit_pr_guard]
+    telemetry = true
+
+then run this script to read the current and rotated logs.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+import json
+import math
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import commit_pr_guard as guard  # noqa: E402
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def read_records(path: Path) -> list[dict[str, object]]:
+    records = []
+    # Oldest first: the rotated file, then the live one.
+    for log in (path.with_name(path.name + ".1"), path):
+        try:
+            lines = log.read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("ms"), (int, float)):
+                records.append(record)
+    return records
+
+
+def summarize(records: list[dict[str, object]]) -> dict[str, dict[str, object]]:
+    by_repo: dict[str, list[dict[str, object]]] = defaultdict(list)
+    for record in records:
+        by_repo[str(record.get("repo") or "?")].append(record)
+
+    summary = {}
+    for repo, repo_records in sorted(by_repo.items()):
+        latencies = sorted(float(record["ms"]) for record in repo_records)
+        git_ms = sorted(
+            sum(float(call[1]) for call in record.get("git") or [] if isinstance(call, list) and len(call) == 2)
+            for record in repo_records
+        )
+        hits = sum(int(record.get("cache_hits") or 0) for record in repo_records)
+        lookups = hits + sum(int(record.get("cache_misses") or 0) for record in repo_records)
+        summary[repo] = {
+            "events": len(latencies),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "git_p50_ms": round(percentile(git_ms, 50), 2),
+            "cache_hit_rate": round(hits / lookups, 3) if lookups else None,
+        }
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report commit_pr_guard hook latency from its telemetry log.")
+    parser.add_argument("--log", type=Path, default=None, help="Telemetry log (default: the guard's state dir)")
+    parser.add_argument("--event", choices=["Stop", "UserPromptSubmit"], help="Only include this hook event")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    records = read_records(args.log or guard.telemetry_path())
+    if args.event:
+        records = [record for record in records if record.get("event") == args.event]
+    summary = summarize(records)
+
+    if args.format == "json":
+        print(json.dumps(summary, indent=2))
+        return 0
+    if not summary:
+        print("no telemetry records", file=sys.stderr)
+        return 0
+    print(f"{'events':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'git p50':>9} {'cache':>6}  repo")
+    for repo, row in summary.items():
+        rate = "-" if row["cache_hit_rate"] is None else f"{row['cache_hit_rate']:.0%}"
+        print(
+            f"{row['events']:>7} {row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms "
+            f"{row['git_p50_ms']:>7.1f}ms {rate:>6}  {repo}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,18 +4,45 @@
 from __future__ import annotations
 
 import argparse
+import email.utils
+import fnmatch
+import hashlib
+import http.client
 import json
 import os
 import pathlib
+import queue
+import random
 import re
+import ssl
 import sys
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
-from typing import Any
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator
 
 API_BASE = "https://api.convex.dev"
 CLIENT_HEADER = "codex-convex-delete-deployments/1.0"
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+CONNECT_TIMEOUT_SECONDS = 10.0
+READ_TIMEOUT_SECONDS = 30.0
+# Exit status when --deadline stopped the run before every delete was attempted or retried.
+EXIT_DEADLINE = 3
+EXIT_INTERRUPTED = 130
+JOURNAL_DIR = pathlib.Path.home() / ".cache" / "convex-delete-deployments" / "journals"
+JOURNAL_FLUSH_SECONDS = 0.2
+JOURNAL_BATCH_LINES = 256
+# Project listings fetched at once by --all-projects, independent of --concurrency.
+LIST_CONCURRENCY = 8
+INVENTORY_DIR = pathlib.Path.home() / ".cache" / "convex-delete-deployments" / "inventory"
+INVENTORY_TTL_SECONDS = 600.0
+# Returned by ConvexClient.get_if_changed when the server answers 304.
+NOT_MODIFIED = object()
 
 
 @dataclass(frozen=True)
@@ -24,10 +51,111 @@ class Deployment:
     deployment_type: str
     region: str | None
     is_default: bool
+    project: str = ""
 
 
 class ConvexApiError(RuntimeError):
-    pass
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class StaleConnectionError(ConvexApiError):
+    """A reused keep-alive connection was closed by the server; the request may or may not have arrived."""
+
+
+class DeadlineExceededError(ConvexApiError):
+    """The deadline stopped a retry; the last failure is in the message and the work may be tried again."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Which failures of an endpoint are safe to retry.
+
+    ``done_on_retry`` lists statuses that, on a retry, mean an earlier
+    attempt already took effect (a delete whose response was lost).
+    """
+
+    statuses: frozenset[int]
+    network_errors: bool
+    done_on_retry: frozenset[int] = frozenset()
+
+
+# Reads are idempotent: retry throttling, server errors and dropped connections.
+READ_POLICY = RetryPolicy(frozenset({429, 500, 502, 503, 504}), network_errors=True)
+# A 500 may come after the delete went through, so only retry statuses that mean it was not attempted.
+DELETE_POLICY = RetryPolicy(frozenset({429, 502, 503, 504}), network_errors=True, done_on_retry=frozenset({404}))
+# Statuses that mean the API wants fewer requests in flight.
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class AdaptiveLimit:
+    """AIMD cap on requests in flight, shared by all worker threads.
+
+    Each success raises the limit by 1/limit (about one slot per round of
+    requests), and throttling halves it, at most once per cooldown so a
+    burst of 429s from one round counts once. The limit stays between 1
+    and ``maximum``.
+    """
+
+    def __init__(self, maximum: int, cooldown: float = 1.0) -> None:
+        self.maximum = maximum
+        self.limit = float(maximum)
+        self.lowest = float(maximum)
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.in_flight -= 1
+                self.condition.notify_all()
+
+    def succeeded(self) -> None:
+        with self.condition:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def throttled(self) -> None:
+        with self.condition:
+            now = time.monotonic()
+            if now - self.last_decrease < self.cooldown:
+                return
+            self.last_decrease = now
+            self.limit = max(1.0, self.limit / 2)
+            self.lowest = min(self.lowest, self.limit)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_seconds(attempt: int, retry_after: float | None) -> float:
+    """Full-jitter exponential backoff, never sooner than the server's Retry-After."""
+    delay = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RETRY_MAX_SECONDS) + random.uniform(0, RETRY_BASE_SECONDS))
+    return delay
 
 
 def parse_args() -> argparse.Namespace:
@@ -39,6 +167,11 @@ def parse_args() -> argparse.Namespace:
         "--project",
         help="Convex project slug (required if CONVEX_PROJECT is unset)",
     )
+    parser.add_argument(
+        "--all-projects",
+        action="store_true",
+        help="Sweep every project in the team instead of one --project.",
+    )
     parser.add_argument(
         "--token",
         help="Convex access token (defaults to CONVEX_ACCESS_TOKEN or ~/.convex/config.json)",
@@ -54,7 +187,7 @@ def parse_args() -> argparse.Namespace:
         "--name",
         action="append",
         default=[],
-        help="Only delete exact deployment names (repeatable).",
+        help="Only delete exact deployment names (repeatable). Also narrows a --policy selection.",
     )
     parser.add_argument(
         "--match",
@@ -66,6 +199,16 @@ def parse_args() -> argparse.Namespace:
         default=[],
         help="Exclude exact deployment names from deletion (repeatable).",
     )
+    parser.add_argument(
+        "--policy",
+        type=pathlib.Path,
+        help="JSON policy file with include/exclude names, globs, regexes, types and regions.",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Also list every kept deployment with the rule that kept it.",
+    )
     parser.add_argument(
         "--include-dev",
         action="store_true",
@@ -86,17 +229,99 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip interactive confirmation when --apply is set.",
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=INVENTORY_TTL_SECONDS,
+        help=(
+            "Seconds a cached listing is used by dry runs without asking the API "
+            f"(default: {INVENTORY_TTL_SECONDS:g}; 0 always revalidates)."
+        ),
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached listings and fetch them in full.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=pathlib.Path,
+        help=f"Where --apply records progress (default: a new file under {JOURNAL_DIR}).",
+    )
+    parser.add_argument(
+        "--resume",
+        type=pathlib.Path,
+        metavar="JOURNAL",
+        help="Continue the deletions a journal still has outstanding instead of listing and filtering again.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Most deletes to run at once with --apply (default: 1). Lowered automatically while throttled.",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=CONNECT_TIMEOUT_SECONDS,
+        help=f"Seconds to wait for a connection to the API (default: {CONNECT_TIMEOUT_SECONDS:g}).",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=READ_TIMEOUT_SECONDS,
+        help=f"Seconds to wait on a response once connected (default: {READ_TIMEOUT_SECONDS:g}).",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help=(
+            "Seconds after start when no new deletes or retries begin. In-flight requests finish "
+            f"within their timeouts; the run exits {EXIT_DEADLINE} listing what was not attempted or retried."
+        ),
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries per request for throttling and transient errors (default: 4).",
+    )
 
     args = parser.parse_args()
     args.team = args.team or os.getenv("CONVEX_TEAM")
-    args.project = args.project or os.getenv("CONVEX_PROJECT")
-
-    if not args.team or not args.project:
+    if args.all_projects and args.project:
+        parser.error("--all-projects sweeps every project; drop --project.")
+    if not args.all_projects:
+        args.project = args.project or os.getenv("CONVEX_PROJECT")
+
+    if args.resume:
+        if args.journal or args.all_projects:
+            parser.error("--resume takes its team, projects and journal from the journal it resumes.")
+    elif args.all_projects and not args.team:
+        parser.error("Provide --team (or set CONVEX_TEAM) with --all-projects.")
+    elif not args.all_projects and (not args.team or not args.project):
         parser.error("Provide --team and --project (or set CONVEX_TEAM / CONVEX_PROJECT).")
 
     if args.yes and not args.apply:
         parser.error("--yes only makes sense with --apply.")
 
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+
+    if args.max_retries < 0:
+        parser.error("--max-retries cannot be negative.")
+
+    if args.connect_timeout <= 0 or args.read_timeout <= 0:
+        parser.error("--connect-timeout and --read-timeout must be positive.")
+
+    if args.cache_ttl < 0:
+        parser.error("--cache-ttl cannot be negative.")
+
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive.")
+
+    # A policy file's types apply only when --type was not given.
+    args.explicit_types = args.types is not None
     args.types = normalize_types(args.types)
     return args
 
@@ -146,39 +371,229 @@ def load_token(cli_token: str | None) -> str:
     return token
 
 
-def api_request(
-    *,
-    method: str,
-    path: str,
-    token: str,
-    payload: dict[str, Any] | None = None,
-) -> Any:
-    body: bytes | None = None
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Convex-Client": CLIENT_HEADER,
-    }
-    if payload is not None:
-        body = json.dumps(payload).encode("utf-8")
-        headers["Content-Type"] = "application/json"
-
-    request = urllib.request.Request(
-        url=f"{API_BASE}{path}",
-        method=method,
-        data=body,
-        headers=headers,
-    )
-
-    try:
-        with urllib.request.urlopen(request) as response:
-            raw_response = response.read().decode("utf-8")
-    except urllib.error.HTTPError as error:
-        details = error.read().decode("utf-8", errors="replace")
+class ConvexClient:
+    """Convex management API client over a small pool of keep-alive connections.
+
+    Connections to the API host are reused across requests and worker
+    threads. When a reused connection turns out to be closed, the request
+    is sent again at once on a fresh connection, as a retry: the first
+    send may have reached the server, so the policy's ``done_on_retry``
+    applies.
+
+    Failures the endpoint's RetryPolicy allows are retried with backoff up
+    to ``max_retries`` times, and every attempt waits for a slot from the
+    shared AdaptiveLimit, which shrinks on throttling. No retry starts or
+    sleeps past ``deadline``; a failure the deadline kept from being retried
+    raises DeadlineExceededError.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        base_url: str | None = None,
+        max_idle: int = 4,
+        max_retries: int = 4,
+        connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = READ_TIMEOUT_SECONDS,
+        deadline: float | None = None,
+    ) -> None:
+        url = urllib.parse.urlsplit(base_url or API_BASE)
+        self.token = token
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.max_idle = max_idle
+        self.ssl_context = ssl.create_default_context() if url.scheme == "https" else None
+        self.idle: list[http.client.HTTPConnection] = []
+        self.lock = threading.Lock()
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # time.monotonic() after which no new attempt starts.
+        self.deadline = deadline
+        self.limit = AdaptiveLimit(max_idle)
+        self.requests = 0
+        self.retries = 0
+        self.opened = 0
+        self.reused = 0
+
+    def new_connection(self) -> http.client.HTTPConnection:
+        with self.lock:
+            self.opened += 1
+        if self.ssl_context is not None:
+            return http.client.HTTPSConnection(self.host, timeout=self.connect_timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, timeout=self.connect_timeout)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection if there is one, else a new one; the flag says whether it was reused."""
+        with self.lock:
+            if self.idle:
+                self.reused += 1
+                return self.idle.pop(), True
+        return self.new_connection(), False
+
+    def release(self, connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+    def stats(self) -> str:
+        summary = (
+            f"{self.requests} request(s), {self.retries} retried; "
+            f"{self.opened} connection(s) opened, {self.reused} reused"
+        )
+        if self.limit.lowest < self.limit.maximum:
+            summary += f"; throttled down to {int(self.limit.lowest)} in flight, ended at {int(self.limit.limit)}"
+        return summary
+
+    def send(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        extra_headers: dict[str, str],
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Convex-Client": CLIENT_HEADER,
+            **extra_headers,
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        if connection.sock is None:
+            # Connect (and TLS handshake) under the connect timeout, then wait on responses with the read one.
+            connection.connect()
+            connection.sock.settimeout(self.read_timeout)
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response, response.read()
+
+    def exchange(
+        self, method: str, path: str, body: bytes | None, extra_headers: dict[str, str], *, fresh: bool = False
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        """One HTTP round trip on a pooled connection, or a new one when ``fresh`` is set."""
+        connection, reused = (self.new_connection(), False) if fresh else self.acquire()
+        try:
+            response, raw = self.send(connection, method, path, body, extra_headers)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as error:
+            connection.close()
+            if reused:
+                raise StaleConnectionError(f"{method} {path} failed: {error}") from error
+            raise ConvexApiError(f"{method} {path} failed: {error}") from error
+        except (OSError, http.client.HTTPException) as error:
+            connection.close()
+            raise ConvexApiError(f"{method} {path} failed: {error}") from error
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(connection)
+        return response, raw
+
+    def fetch(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        policy: RetryPolicy,
+        extra_headers: dict[str, str],
+    ) -> tuple[http.client.HTTPResponse | None, bytes]:
+        """Send with retries; returns the final response, or None when a retry found the work done."""
+        with self.lock:
+            self.requests += 1
+
+        attempt = 1
+        fresh = False
+        while True:
+            retry_after = None
+            response = None
+            network_error = None
+            try:
+                with self.limit.slot():
+                    response, raw = self.exchange(method, path, body, extra_headers, fresh=fresh)
+            except StaleConnectionError as error:
+                if self.expired():
+                    raise DeadlineExceededError(str(error)) from error
+                # Usually an idle connection the server timed out, so resend without backoff.
+                with self.lock:
+                    self.retries += 1
+                fresh = True
+                attempt += 1
+                continue
+            except ConvexApiError as error:
+                if not policy.network_errors or attempt > self.max_retries:
+                    raise
+                network_error = error
+            else:
+                status = response.status
+                if status in THROTTLE_STATUSES:
+                    self.limit.throttled()
+                elif status < 400:
+                    self.limit.succeeded()
+                if attempt > 1 and status in policy.done_on_retry:
+                    return None, b""
+                if status not in policy.statuses or attempt > self.max_retries:
+                    break
+                retry_after = retry_after_seconds(response.getheader("Retry-After"))
+
+            fresh = False
+            delay = backoff_seconds(attempt, retry_after)
+            if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+                if network_error is not None:
+                    raise DeadlineExceededError(str(network_error), status=network_error.status) from network_error
+                raise DeadlineExceededError(
+                    f"{method} {path} failed with {status} and the deadline left no time to retry",
+                    status=status,
+                )
+            with self.lock:
+                self.retries += 1
+            time.sleep(delay)
+            attempt += 1
+        return response, raw
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        policy: RetryPolicy = READ_POLICY,
+    ) -> Any:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        response, raw = self.fetch(method, path, body, policy, {})
+        if response is None:
+            return None
+        return decode_response(method, path, response, raw)
+
+    def get_if_changed(self, path: str, etag: str | None) -> tuple[Any, str | None]:
+        """Conditional GET: (NOT_MODIFIED, etag) on 304, else the decoded body and its ETag, if any."""
+        response, raw = self.fetch("GET", path, None, READ_POLICY, {"If-None-Match": etag} if etag else {})
+        assert response is not None
+        if response.status == 304:
+            return NOT_MODIFIED, etag
+        return decode_response("GET", path, response, raw), response.getheader("ETag")
+
+
+def decode_response(method: str, path: str, response: http.client.HTTPResponse, raw: bytes) -> Any:
+    status = response.status
+    raw_response = raw.decode("utf-8", errors="replace")
+    if status >= 400:
         raise ConvexApiError(
-            f"{method} {path} failed with {error.code}: {details.strip() or error.reason}"
-        ) from error
-    except urllib.error.URLError as error:
-        raise ConvexApiError(f"{method} {path} failed: {error.reason}") from error
+            f"{method} {path} failed with {status}: {raw_response.strip() or response.reason}",
+            status=status,
+        )
 
     if not raw_response.strip():
         return None
@@ -189,12 +604,91 @@ def api_request(
         return raw_response
 
 
-def list_deployments(team: str, project: str, token: str) -> list[Deployment]:
-    data = api_request(
-        method="GET",
-        path=f"/api/teams/{team}/projects/{project}/deployments",
-        token=token,
-    )
+class InventoryCache:
+    """Raw listing responses on disk, one JSON file per API path.
+
+    Within ``ttl`` a cached listing is used without a request. Past it, or
+    when ``revalidate`` is set (applied runs always revalidate), the listing
+    is fetched with If-None-Match so an unchanged inventory costs a 304.
+    ``refresh`` skips the cache and the ETag. ``forget`` drops deleted
+    deployments so later dry runs see what the run left behind.
+    """
+
+    def __init__(self, directory: pathlib.Path, ttl: float, *, refresh: bool = False, revalidate: bool = False) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.refresh = refresh
+        self.revalidate = revalidate
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.fetched = 0
+
+    def entry_path(self, api_path: str) -> pathlib.Path:
+        return self.directory / f"{hashlib.sha256(api_path.encode('utf-8')).hexdigest()[:24]}.json"
+
+    def read(self, api_path: str) -> dict[str, Any] | None:
+        try:
+            entry = json.loads(self.entry_path(api_path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get("path") != api_path or "data" not in entry:
+            return None
+        return entry
+
+    def write(self, api_path: str, data: Any, etag: str | None, fetched_at: float) -> None:
+        target = self.entry_path(api_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(
+            json.dumps({"path": api_path, "fetched_at": fetched_at, "etag": etag, "data": data}),
+            encoding="utf-8",
+        )
+        os.replace(temporary, target)
+
+    def get(self, client: ConvexClient, api_path: str) -> Any:
+        entry = None if self.refresh else self.read(api_path)
+        if entry is not None and not self.revalidate and time.time() - float(entry.get("fetched_at", 0)) < self.ttl:
+            with self.lock:
+                self.hits += 1
+            return entry["data"]
+
+        data, etag = client.get_if_changed(api_path, entry.get("etag") if entry else None)
+        if data is NOT_MODIFIED:
+            assert entry is not None
+            data = entry["data"]
+            with self.lock:
+                self.not_modified += 1
+        else:
+            with self.lock:
+                self.fetched += 1
+        self.write(api_path, data, etag, time.time())
+        return data
+
+    def forget(self, api_path: str, names: set[str]) -> None:
+        entry = self.read(api_path)
+        if entry is None or not isinstance(entry["data"], list):
+            return
+        remaining = [item for item in entry["data"] if not (isinstance(item, dict) and item.get("name") in names)]
+        # The server's ETag described the old list; keep the age so the TTL still applies.
+        self.write(api_path, remaining, None, float(entry.get("fetched_at", 0)))
+
+    def drop(self, api_path: str) -> None:
+        self.entry_path(api_path).unlink(missing_ok=True)
+
+    def stats(self) -> str:
+        return f"{self.hits} listing(s) from cache, {self.not_modified} unchanged (304), {self.fetched} fetched"
+
+
+def deployments_path(team: str, project: str) -> str:
+    return f"/api/teams/{team}/projects/{project}/deployments"
+
+
+def list_deployments(
+    client: ConvexClient, team: str, project: str, cache: InventoryCache | None = None
+) -> list[Deployment]:
+    path = deployments_path(team, project)
+    data = cache.get(client, path) if cache else client.request("GET", path)
 
     if not isinstance(data, list):
         raise ConvexApiError("Unexpected response when listing deployments.")
@@ -213,44 +707,279 @@ def list_deployments(team: str, project: str, token: str) -> list[Deployment]:
                 deployment_type=deployment_type,
                 region=item.get("region") if isinstance(item.get("region"), str) else None,
                 is_default=bool(item.get("isDefault")),
+                project=project,
             )
         )
 
     return deployments
 
 
-def should_keep(
-    deployment: Deployment,
-    *,
-    target_types: set[str],
-    names_filter: set[str],
-    exclude_filter: set[str],
-    name_pattern: re.Pattern[str] | None,
-    include_dev: bool,
-    include_prod: bool,
-) -> bool:
-    if deployment.deployment_type not in target_types:
-        return True
+def list_projects(client: ConvexClient, team: str, cache: InventoryCache | None = None) -> list[str]:
+    path = f"/api/teams/{team}/projects"
+    data = cache.get(client, path) if cache else client.request("GET", path)
+
+    if not isinstance(data, list):
+        raise ConvexApiError("Unexpected response when listing projects.")
+
+    return sorted({item["slug"] for item in data if isinstance(item, dict) and isinstance(item.get("slug"), str)})
+
 
-    if names_filter and deployment.name not in names_filter:
-        return True
+def list_team_deployments(
+    client: ConvexClient, team: str, projects: list[str], cache: InventoryCache | None = None
+) -> tuple[dict[str, list[Deployment]], dict[str, str]]:
+    """Fetch every project's deployments concurrently; returns inventories and per-project errors."""
+    inventories: dict[str, list[Deployment]] = {}
+    errors: dict[str, str] = {}
 
-    if deployment.name in exclude_filter:
-        return True
+    def fetch(project: str) -> list[Deployment] | str:
+        try:
+            return list_deployments(client, team, project, cache)
+        except ConvexApiError as error:
+            return str(error)
 
-    if name_pattern and not name_pattern.search(deployment.name):
-        return True
+    with ThreadPoolExecutor(max_workers=max(1, min(LIST_CONCURRENCY, len(projects)))) as pool:
+        for project, result in zip(projects, pool.map(fetch, projects)):
+            if isinstance(result, str):
+                errors[project] = result
+            else:
+                inventories[project] = result
+    return inventories, errors
 
-    if deployment.deployment_type == "prod" and not include_prod:
-        return True
 
-    if deployment.deployment_type == "dev" and not include_dev:
-        return True
+POLICY_KEYS = {
+    "include": {"names", "globs", "regexes", "types", "regions"},
+    "exclude": {"names", "globs", "regexes", "regions"},
+}
 
-    return False
 
+def load_policy(path: pathlib.Path) -> dict[str, Any]:
+    """Read and validate a policy file.
+
+    {
+      "include": {"names": [], "globs": [], "regexes": [], "types": [], "regions": []},
+      "exclude": {"names": [], "globs": [], "regexes": [], "regions": []},
+      "protect_default": true
+    }
+
+    Every key is optional. Unknown keys are rejected so a typo cannot
+    silently widen a delete.
+    """
+    try:
+        policy = json.loads(path.read_text(encoding="utf-8"))
+    except OSError as error:
+        raise SystemExit(f"Cannot read policy {path}: {error}") from error
+    except json.JSONDecodeError as error:
+        raise SystemExit(f"Invalid JSON in {path}: {error}") from error
+
+    if not isinstance(policy, dict):
+        raise SystemExit(f"Policy {path} must be a JSON object.")
+    unknown = set(policy) - {*POLICY_KEYS, "protect_default"}
+    if unknown:
+        raise SystemExit(f"Unknown key(s) in policy {path}: {', '.join(sorted(unknown))}.")
+    for section, allowed in POLICY_KEYS.items():
+        rules = policy.setdefault(section, {})
+        if not isinstance(rules, dict):
+            raise SystemExit(f"Policy {path}: '{section}' must be an object.")
+        unknown = set(rules) - allowed
+        if unknown:
+            raise SystemExit(f"Unknown key(s) in policy {path} '{section}': {', '.join(sorted(unknown))}.")
+        for key, values in rules.items():
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise SystemExit(f"Policy {path}: '{section}.{key}' must be a list of strings.")
+    if not isinstance(policy.setdefault("protect_default", True), bool):
+        raise SystemExit(f"Policy {path}: 'protect_default' must be true or false.")
+    return policy
+
+
+def compile_rules(rules: list[tuple[str, str]]) -> re.Pattern[str] | None:
+    """Join (label, regex) rules into one alternation; group ``r<i>`` names the rule that matched."""
+    if not rules:
+        return None
+    for label, source in rules:
+        try:
+            re.compile(source)
+        except re.error as error:
+            raise SystemExit(f"Invalid pattern in {label}: {error}") from error
+    try:
+        return re.compile("|".join(f"(?P<r{index}>{source})" for index, (_, source) in enumerate(rules)))
+    except re.error as error:
+        # Valid alone but not inside a group, e.g. a global (?i) flag or a reused group name.
+        raise SystemExit(f"Policy patterns cannot be combined: {error}") from error
+
+
+@dataclass
+class RuleSet:
+    """One side of a policy (include or exclude), compiled once.
+
+    Exact names are a dict lookup. Globs must match the whole name, so they
+    are joined into one pattern tried once per name with ``fullmatch``;
+    regexes may match anywhere, like --match, and are joined into one
+    pattern for ``search``. ``re`` still tries the alternatives of each
+    pattern in turn, so matching cost grows with the number of globs and
+    regexes, but only as one combined call each.
+    """
+
+    names: dict[str, str] = field(default_factory=dict)
+    globs: list[tuple[str, str]] = field(default_factory=list)
+    regexes: list[tuple[str, str]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.glob_pattern = compile_rules([(label, fnmatch.translate(glob)) for label, glob in self.globs])
+        self.regex_pattern = compile_rules(self.regexes)
+
+    def __bool__(self) -> bool:
+        return bool(self.names or self.globs or self.regexes)
+
+    def match(self, name: str) -> str | None:
+        """Label of the first rule matching ``name``, or None."""
+        if name in self.names:
+            return self.names[name]
+        if self.glob_pattern and (match := self.glob_pattern.fullmatch(name)):
+            return self.globs[int(str(match.lastgroup)[1:])][0]
+        if self.regex_pattern and (match := self.regex_pattern.search(name)):
+            return self.regexes[int(str(match.lastgroup)[1:])][0]
+        return None
 
-def render_table(deployments: list[Deployment]) -> str:
+
+def policy_rules(section: str, rules: dict[str, list[str]]) -> RuleSet:
+    return RuleSet(
+        names={name: f"policy {section}.names" for name in rules.get("names", [])},
+        globs=[(f"policy {section}.globs {glob!r}", glob) for glob in rules.get("globs", [])],
+        regexes=[(f"policy {section}.regexes {regex!r}", regex) for regex in rules.get("regexes", [])],
+    )
+
+
+@dataclass
+class Selector:
+    """Every deployment filter, compiled once.
+
+    ``classify`` also names the rule that decided, for dry-run explanations.
+    Checks run in the order the CLI filters always have. --name and --match
+    only ever narrow a policy, and the dev/prod guards cannot be lifted by
+    one.
+    """
+
+    target_types: set[str]
+    include_dev: bool
+    include_prod: bool
+    names: set[str] = field(default_factory=set)
+    include: RuleSet = field(default_factory=RuleSet)
+    exclude: RuleSet = field(default_factory=RuleSet)
+    name_pattern: re.Pattern[str] | None = None
+    include_regions: set[str] = field(default_factory=set)
+    exclude_regions: set[str] = field(default_factory=set)
+    protect_default: bool = False
+
+    def classify(self, deployment: Deployment) -> tuple[bool, str]:
+        """Return (selected for deletion, the rule that decided)."""
+        name = deployment.name
+        if deployment.deployment_type not in self.target_types:
+            return False, f"type {deployment.deployment_type} not targeted"
+
+        selected_by = f"type {deployment.deployment_type}"
+        if self.names:
+            if name not in self.names:
+                return False, "not named by --name"
+            selected_by = "--name"
+
+        if self.include:
+            rule = self.include.match(name)
+            if rule is None:
+                return False, "matches no policy include rule"
+            selected_by = f"{selected_by} and {rule}" if self.names else rule
+
+        rule = self.exclude.match(name)
+        if rule is not None:
+            return False, f"excluded by {rule}"
+
+        if self.name_pattern and not self.name_pattern.search(name):
+            return False, f"does not match --match {self.name_pattern.pattern!r}"
+
+        region = deployment.region or "-"
+        if self.include_regions and region not in self.include_regions:
+            return False, f"region {region} not in policy include.regions"
+
+        if region in self.exclude_regions:
+            return False, f"region {region} in policy exclude.regions"
+
+        if deployment.deployment_type == "prod" and not self.include_prod:
+            return False, "prod needs --include-prod"
+
+        if deployment.deployment_type == "dev" and not self.include_dev:
+            return False, "dev needs --include-dev"
+
+        if self.protect_default and deployment.is_default:
+            return False, "default deployment (policy protect_default)"
+
+        return True, selected_by
+
+
+def build_selector(args: argparse.Namespace) -> Selector:
+    target_types = set(args.types)
+    names = {name.strip() for name in args.name if name.strip()}
+    cli_excludes = {name.strip(): "--exclude" for name in args.exclude if name.strip()}
+    name_pattern = re.compile(args.match) if args.match else None
+    if not args.policy:
+        return Selector(
+            target_types=target_types,
+            include_dev=args.include_dev,
+            include_prod=args.include_prod,
+            names=names,
+            exclude=RuleSet(names=cli_excludes),
+            name_pattern=name_pattern,
+        )
+
+    policy = load_policy(args.policy)
+    include, exclude = policy["include"], policy["exclude"]
+    if include.get("types") and not args.explicit_types:
+        target_types = normalize_types(include["types"])
+    exclude_rules = policy_rules("exclude", exclude)
+    exclude_rules.names.update(cli_excludes)
+    return Selector(
+        target_types=target_types,
+        include_dev=args.include_dev,
+        include_prod=args.include_prod,
+        names=names,
+        include=policy_rules("include", include),
+        exclude=exclude_rules,
+        name_pattern=name_pattern,
+        include_regions=set(include.get("regions", [])),
+        exclude_regions=set(exclude.get("regions", [])),
+        protect_default=policy["protect_default"],
+    )
+
+
+@dataclass
+class Selection:
+    candidates: list[Deployment]
+    kept: list[Deployment]
+    # The deciding rule for every deployment, selected or kept, by name.
+    rules: dict[str, str]
+
+
+def select_candidates(selector: Selector, deployments: list[Deployment]) -> Selection:
+    selection = Selection(candidates=[], kept=[], rules={})
+    for deployment in deployments:
+        selected, rule = selector.classify(deployment)
+        (selection.candidates if selected else selection.kept).append(deployment)
+        selection.rules[deployment.name] = rule
+    return selection
+
+
+def render_kept(selection: Selection, explain: bool) -> str:
+    """Count kept deployments per deciding rule, or list each one with --explain."""
+    if not selection.kept:
+        return "Kept: (none)"
+    if explain:
+        return "Kept:\n" + render_table(selection.kept, selection.rules)
+    counts = Counter(selection.rules[deployment.name] for deployment in selection.kept)
+    width = len(str(max(counts.values())))
+    lines = [f"Kept {len(selection.kept)} deployment(s):"]
+    lines += [f"  {count:>{width}}  {rule}" for rule, count in counts.most_common()]
+    return "\n".join(lines)
+
+
+def render_table(deployments: list[Deployment], rules: dict[str, str] | None = None) -> str:
     if not deployments:
         return "(none)"
 
@@ -264,19 +993,152 @@ def render_table(deployments: list[Deployment]) -> str:
 
     header = f"{'name':<{widths[0]}}  {'type':<{widths[1]}}  {'region':<{widths[2]}}  default"
     separator = f"{'-' * widths[0]}  {'-' * widths[1]}  {'-' * widths[2]}  {'-' * len('default')}"
+    if rules is not None:
+        header += "  rule"
+        separator += "  ----"
     lines = [header, separator]
     for row in rows:
-        lines.append(f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]:<{widths[2]}}  {row[3]}")
+        line = f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]:<{widths[2]}}  {row[3]:<7}"
+        if rules is not None:
+            line += f"  {rules.get(row[0], '')}"
+        lines.append(line.rstrip())
     return "\n".join(lines)
 
 
-def delete_deployment(name: str, token: str) -> None:
-    api_request(
-        method="POST",
-        path=f"/v1/deployments/{name}/delete",
-        token=token,
-        payload={},
-    )
+def delete_deployment(client: ConvexClient, name: str) -> None:
+    client.request("POST", f"/v1/deployments/{name}/delete", payload={}, policy=DELETE_POLICY)
+
+
+class Journal:
+    """Append-only JSONL record of an applied run, readable by ``--resume``.
+
+    Workers only enqueue records. A background thread writes them in
+    batches and fsyncs once per batch (every JOURNAL_FLUSH_SECONDS or
+    JOURNAL_BATCH_LINES lines), so deletes never wait on the disk. A crash
+    can lose the last batch; resumed deletes therefore treat 404 as done.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.file = path.open("a", encoding="utf-8")
+        self.queue: queue.Queue[dict[str, Any] | None] = queue.Queue()
+        self.writer = threading.Thread(target=self.write_batches, daemon=True)
+        self.writer.start()
+
+    def record(self, event: str, **fields: Any) -> None:
+        self.queue.put({"t": round(time.time(), 3), "event": event, **fields})
+
+    def write_batches(self) -> None:
+        done = False
+        while not done:
+            batch = [self.queue.get()]
+            flush_at = time.monotonic() + JOURNAL_FLUSH_SECONDS
+            while len(batch) < JOURNAL_BATCH_LINES and batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, flush_at - time.monotonic())))
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            lines = [json.dumps(item, separators=(",", ":")) + "\n" for item in batch if item is not None]
+            if lines:
+                self.file.write("".join(lines))
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.writer.join()
+        self.file.close()
+
+
+def load_journal(path: pathlib.Path) -> tuple[str, str, list[Deployment], set[str]]:
+    """Read a journal back as (team, project, planned deployments, names already deleted)."""
+    plan: dict[str, Any] | None = None
+    deleted: set[str] = set()
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as error:
+        raise SystemExit(f"Cannot read journal {path}: {error}") from error
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn last line from an interrupted write.
+            continue
+        if not isinstance(record, dict):
+            continue
+        if record.get("event") == "plan" and plan is None:
+            plan = record
+        elif record.get("event") == "deleted":
+            deleted.add(str(record.get("name")))
+    if plan is None:
+        raise SystemExit(f"Journal {path} has no plan record; it cannot be resumed.")
+    planned = [Deployment(**item) for item in plan["deployments"]]
+    return plan["team"], plan["project"], planned, deleted
+
+
+def default_journal_path(team: str, project: str) -> pathlib.Path:
+    return JOURNAL_DIR / f"{team}-{project}-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+
+
+def delete_one(
+    client: ConvexClient, deployment: Deployment, journal: Journal, *, resumed: bool = False
+) -> tuple[str, str]:
+    """Return ("deleted" | "failed" | "skipped", error message).
+
+    A delete the deadline kept from starting or from being retried is skipped, so --resume tries it again.
+    """
+    if client.expired():
+        return "skipped", ""
+    journal.record("in_flight", name=deployment.name)
+    try:
+        delete_deployment(client, deployment.name)
+    except DeadlineExceededError as error:
+        journal.record("skipped", name=deployment.name, error=str(error))
+        return "skipped", str(error)
+    except ConvexApiError as error:
+        # A resumed run may repeat a delete whose journal line was lost in the interruption.
+        if not (resumed and error.status == 404):
+            journal.record("failed", name=deployment.name, error=str(error))
+            return "failed", str(error)
+    journal.record("deleted", name=deployment.name)
+    return "deleted", ""
+
+
+def delete_all(
+    client: ConvexClient,
+    deployments: list[Deployment],
+    concurrency: int,
+    journal: Journal,
+    *,
+    resumed: bool = False,
+) -> tuple[list[tuple[str, str]], list[str]]:
+    """Delete through a bounded worker pool, reporting each result in candidate order.
+
+    Returns the failures and the names the deadline left unattempted or unretried.
+    On Ctrl-C the remaining queued deletes are skipped before re-raising.
+    """
+    failed: list[tuple[str, str]] = []
+    skipped: list[str] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # map() yields in submission order, so output stays stable however the deletes finish.
+        results = pool.map(lambda deployment: delete_one(client, deployment, journal, resumed=resumed), deployments)
+        try:
+            for deployment, (outcome, error) in zip(deployments, results):
+                if outcome == "deleted":
+                    print(f"deleted: {deployment.name}", flush=True)
+                elif outcome == "skipped":
+                    skipped.append(deployment.name)
+                    print(f"skipped: {deployment.name}", flush=True)
+                else:
+                    failed.append((deployment.name, error))
+                    print(f"failed: {deployment.name}", flush=True)
+        except KeyboardInterrupt:
+            # Queued deletes see the expired deadline and return at once; in-flight ones finish.
+            client.deadline = time.monotonic()
+            raise
+    return failed, skipped
 
 
 def confirm_or_exit(target_count: int) -> None:
@@ -290,39 +1152,136 @@ def confirm_or_exit(target_count: int) -> None:
 
 def main() -> int:
     args = parse_args()
-    token = load_token(args.token)
+    client = ConvexClient(
+        load_token(args.token),
+        # Deletes stay bounded by their worker pool; the extra room lets project listings run together.
+        max_idle=max(args.concurrency, LIST_CONCURRENCY) if args.all_projects else args.concurrency,
+        max_retries=args.max_retries,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        deadline=time.monotonic() + args.deadline if args.deadline is not None else None,
+    )
+    # Applied runs always revalidate, so deletes never act on a listing the API has not confirmed.
+    cache = InventoryCache(INVENTORY_DIR, args.cache_ttl, refresh=args.refresh, revalidate=args.apply)
+    try:
+        return run(args, client, cache)
+    finally:
+        client.close()
+        print(f"API: {client.stats()}", file=sys.stderr)
+        print(f"Inventory: {cache.stats()}", file=sys.stderr)
+
+
+def run(args: argparse.Namespace, client: ConvexClient, cache: InventoryCache) -> int:
+    if args.resume:
+        args.team, args.project, planned, deleted = load_journal(args.resume)
+        delete_candidates = [deployment for deployment in planned if deployment.name not in deleted]
+        print(f"Mode: {'APPLY' if args.apply else 'DRY-RUN'} (resuming {args.resume})")
+        print(f"Team/Project: {args.team}/{args.project}")
+        print(f"Planned in journal: {len(planned)}, already deleted: {len(planned) - len(delete_candidates)}")
+        print(f"Delete candidates: {len(delete_candidates)}")
+        print(render_table(delete_candidates))
+        return apply_deletions(args, client, cache, delete_candidates)
+
+    # Compile filters before listing so a bad policy fails without touching the API.
+    selector = build_selector(args)
+    if args.all_projects:
+        return run_all_projects(args, client, cache, selector)
 
     try:
-        deployments = list_deployments(args.team, args.project, token)
+        deployments = list_deployments(client, args.team, args.project, cache)
     except ConvexApiError as error:
         print(f"Error: {error}", file=sys.stderr)
         return 1
 
-    names_filter = {name.strip() for name in args.name if name.strip()}
-    exclude_filter = {name.strip() for name in args.exclude if name.strip()}
-    name_pattern = re.compile(args.match) if args.match else None
-
-    delete_candidates = [
-        deployment
-        for deployment in deployments
-        if not should_keep(
-            deployment,
-            target_types=args.types,
-            names_filter=names_filter,
-            exclude_filter=exclude_filter,
-            name_pattern=name_pattern,
-            include_dev=args.include_dev,
-            include_prod=args.include_prod,
-        )
-    ]
+    selection = select_candidates(selector, deployments)
+    delete_candidates = selection.candidates
 
     mode = "APPLY" if args.apply else "DRY-RUN"
     print(f"Mode: {mode}")
     print(f"Team/Project: {args.team}/{args.project}")
     print(f"Total deployments in project: {len(deployments)}")
     print(f"Delete candidates: {len(delete_candidates)}")
-    print(render_table(delete_candidates))
+    print(render_table(delete_candidates, selection.rules))
+    if not args.apply:
+        print(render_kept(selection, args.explain))
+    return apply_deletions(args, client, cache, delete_candidates)
+
+
+def run_all_projects(
+    args: argparse.Namespace, client: ConvexClient, cache: InventoryCache, selector: Selector
+) -> int:
+    try:
+        projects = list_projects(client, args.team, cache)
+    except ConvexApiError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    inventories, errors = list_team_deployments(client, args.team, projects, cache)
 
+    mode = "APPLY" if args.apply else "DRY-RUN"
+    print(f"Mode: {mode}")
+    print(f"Team: {args.team} ({len(projects)} project(s))")
+
+    delete_candidates: list[Deployment] = []
+    for project in projects:
+        if project in errors:
+            print(f"\nProject {project}: listing failed: {errors[project]}")
+            continue
+        selection = select_candidates(selector, inventories[project])
+        selected = selection.candidates
+        print(f"\nProject {project}: {len(inventories[project])} deployment(s), {len(selected)} delete candidate(s)")
+        if selected:
+            print(render_table(selected, selection.rules))
+        if not args.apply:
+            print(render_kept(selection, args.explain))
+        delete_candidates.extend(selected)
+
+    print(f"\nDelete candidates across the team: {len(delete_candidates)}")
+    code = apply_deletions(args, client, cache, delete_candidates)
+    if errors:
+        print(f"\nListing failed for {len(errors)} project(s): {', '.join(sorted(errors))}", file=sys.stderr)
+        return code or 1
+    return code
+
+
+def forget_deleted(
+    cache: InventoryCache,
+    team: str,
+    delete_candidates: list[Deployment],
+    failed: list[tuple[str, str]],
+    skipped: list[str],
+) -> None:
+    left = {name for name, _ in failed} | set(skipped)
+    by_project: dict[str, set[str]] = {}
+    for deployment in delete_candidates:
+        if deployment.name not in left:
+            by_project.setdefault(deployment.project, set()).add(deployment.name)
+    for project, names in by_project.items():
+        if project:
+            cache.forget(deployments_path(team, project), names)
+
+
+def print_project_summary(
+    delete_candidates: list[Deployment], failed: list[tuple[str, str]], skipped: list[str]
+) -> None:
+    failed_names = {name for name, _ in failed}
+    skipped_names = set(skipped)
+    counts: dict[str, list[int]] = {}
+    for deployment in delete_candidates:
+        row = counts.setdefault(deployment.project, [0, 0, 0])
+        if deployment.name in failed_names:
+            row[1] += 1
+        elif deployment.name in skipped_names:
+            row[2] += 1
+        else:
+            row[0] += 1
+    print("\nPer-project results:")
+    for project, (deleted, failures, not_attempted) in sorted(counts.items()):
+        print(f"- {project}: {deleted} deleted, {failures} failed, {not_attempted} not attempted")
+
+
+def apply_deletions(
+    args: argparse.Namespace, client: ConvexClient, cache: InventoryCache, delete_candidates: list[Deployment]
+) -> int:
     if not args.apply:
         print("\nDry-run only. Re-run with --apply to execute deletions.")
         return 0
@@ -334,19 +1293,51 @@ def main() -> int:
     if not args.yes:
         confirm_or_exit(len(delete_candidates))
 
-    failed: list[tuple[str, str]] = []
-    for deployment in delete_candidates:
-        try:
-            delete_deployment(deployment.name, token)
-            print(f"deleted: {deployment.name}")
-        except ConvexApiError as error:
-            failed.append((deployment.name, str(error)))
-            print(f"failed: {deployment.name}")
+    journal_path = args.resume or args.journal or default_journal_path(args.team, args.project or "all-projects")
+    journal = Journal(journal_path)
+    if args.resume:
+        journal.record("resume", outstanding=len(delete_candidates))
+    else:
+        journal.record(
+            "plan",
+            team=args.team,
+            project=args.project or "*",
+            deployments=[asdict(deployment) for deployment in delete_candidates],
+        )
+    print(f"Journal: {journal_path}", file=sys.stderr)
+
+    try:
+        failed, skipped = delete_all(
+            client, delete_candidates, args.concurrency, journal, resumed=bool(args.resume)
+        )
+    except KeyboardInterrupt:
+        # Which deletes landed is only in the journal now, so the cached listings cannot be trusted.
+        for project in {deployment.project for deployment in delete_candidates if deployment.project}:
+            cache.drop(deployments_path(args.team, project))
+        print(f"\nInterrupted. Continue with --resume {journal_path} --apply", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        journal.close()
+
+    forget_deleted(cache, args.team, delete_candidates, failed, skipped)
+
+    # Team sweeps always get the summary, even when every candidate is in one project.
+    if args.all_projects or args.project == "*":
+        print_project_summary(delete_candidates, failed, skipped)
 
     if failed:
         print("\nSome deletions failed:", file=sys.stderr)
         for name, message in failed:
             print(f"- {name}: {message}", file=sys.stderr)
+
+    if skipped:
+        print(f"\nDeadline reached; {len(skipped)} deletion(s) were not attempted or not retried:", file=sys.stderr)
+        for name in skipped:
+            print(f"- {name}", file=sys.stderr)
+        print(f"Continue with --resume {journal_path} --apply", file=sys.stderr)
+        return EXIT_DEADLINE
+
+    if failed:
         return 1
 
     print("\nAll selected deployments deleted successfully.")